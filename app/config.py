@@ -1,8 +1,14 @@
+import os
+import sys
 from pathlib import Path
 
 from environs import Env
 from loguru import logger
 
+from app.utils.log_sinks import (
+    DailyFileSink, LogSampler, json_formatter, parse_log_settings
+)
+
 ENV = Env(expand_vars=True)
 ENV.read_env()
 
@@ -14,6 +20,26 @@ DB_URL = (
     Path(f"{BASE_DIR}/app/db").mkdir(parents=True, exist_ok=True) or
     f"sqlite+aiosqlite:///{BASE_DIR}/app/db/{BASE_DIR.stem}.sqlite3"
 )
+DB_IS_SQLITE = DB_URL.startswith("sqlite")
+with ENV.prefixed("DB_POOL_"):
+    DB_POOL_SIZE = ENV.int("SIZE", 5 if DB_IS_SQLITE else 10)
+    DB_POOL_MAX_OVERFLOW = ENV.int("MAX_OVERFLOW", 5 if DB_IS_SQLITE else 20)
+    DB_POOL_RECYCLE = ENV.int("RECYCLE", -1 if DB_IS_SQLITE else 1800)
+    DB_POOL_PRE_PING = ENV.bool("PRE_PING", not DB_IS_SQLITE)
+    DB_POOL_TIMEOUT = ENV.float("TIMEOUT", 30.0)
+
+with ENV.prefixed("SQLITE_"):
+    SQLITE_SYNCHRONOUS = ENV.str("SYNCHRONOUS", "NORMAL").upper()
+    SQLITE_BUSY_TIMEOUT = ENV.int("BUSY_TIMEOUT", 5000)
+    SQLITE_CACHE_SIZE = ENV.int("CACHE_SIZE", -64000)
+    SQLITE_MMAP_SIZE = ENV.int("MMAP_SIZE", 256 * 2 ** 20)
+    SQLITE_SINGLE_WRITER = ENV.bool("SINGLE_WRITER", True)
+    SQLITE_GROUP_COMMIT_MAX_SIZE = ENV.int("GROUP_COMMIT_MAX_SIZE", 100)
+
+# Read-only routes are served by replicas, if any
+DB_REPLICA_URLS = ENV.list("DB_REPLICA_URLS", [])
+DB_READ_YOUR_WRITES_WINDOW = ENV.float("DB_READ_YOUR_WRITES_WINDOW", 5.0)
+
 ROLE_PERMISSIONS = {
     "Owner": (
         "Can create, read, modify, delete tasks, "
@@ -44,11 +70,31 @@ TASK_PRIORITY_LABELS = {
     5: "Lowest"
 }
 TASK_STATUSES = ["TODO", "In progress", "Done", "Backlog"]
+REFERENCE_DATA_CACHE_MAX_AGE = 24 * 60 * 60
+# Seconds between checks whether another process changed reference data
+REFERENCE_DATA_POLL_INTERVAL = ENV.float("REFERENCE_DATA_POLL_INTERVAL", 10.0)
+TASK_PAGE_DEFAULT_LIMIT = 50
+TASK_PAGE_MAX_LIMIT = 500
+TASK_BULK_MAX_SIZE = 5000
+USER_IMPORT_BATCH_SIZE = 500
+TASK_EXPORT_BATCH_SIZE = ENV.int("TASK_EXPORT_BATCH_SIZE", 1000)
+METRICS_ENABLED = ENV.bool("METRICS_ENABLED", True)
+
+with ENV.prefixed("SQL_INSTRUMENTATION_"):
+    SQL_INSTRUMENTATION_ENABLED = ENV.bool("ENABLED", False)
+    SQL_INSTRUMENTATION_QUERY_BUDGET = ENV.int("QUERY_BUDGET", 20)
+
 with ENV.prefixed("MAIL_"):
     MAIL_HOST = ENV.str("HOST")
     MAIL_USERNAME = ENV.str("USERNAME")
     MAIL_PASSWORD = ENV.str("PASSWORD")
     MAIL_PORT = ENV.int("PORT")
+    MAIL_STARTTLS = ENV.bool("STARTTLS", True)
+    MAIL_CONCURRENCY = ENV.int("CONCURRENCY", 2)
+    MAIL_QUEUE_SIZE = ENV.int("QUEUE_SIZE", 1000)
+    MAIL_MAX_RETRIES = ENV.int("MAX_RETRIES", 3)
+    MAIL_SHUTDOWN_TIMEOUT = ENV.float("SHUTDOWN_TIMEOUT", 10.0)
+    MAIL_DIGEST_WINDOW = ENV.float("DIGEST_WINDOW", 0.0)
 
 with ENV.prefixed("AUTH_JWT_"):
     AUTH_JWT_ALGORITHM = ENV.str("ALGORITHM")
@@ -56,10 +102,49 @@ with ENV.prefixed("AUTH_JWT_"):
     AUTH_JWT_PUBLIC_KEY = ENV.path("PUBLIC_KEY_PATH").read_text()
     AUTH_JWT_ACCESS_TOKEN_EXPIRE_MINUTES = ENV.int(
         "ACCESS_TOKEN_EXPIRE_MINUTES")
+    AUTH_JWT_TRUST_CLAIMS = ENV.bool("TRUST_CLAIMS", False)
+    AUTH_JWT_VERIFIED_CACHE_SIZE = ENV.int("VERIFIED_CACHE_SIZE", 4096)
+
+with ENV.prefixed("PASSWORD_HASHING_"):
+    PASSWORD_HASHING_BCRYPT_ROUNDS = ENV.int("BCRYPT_ROUNDS", 12)
+    PASSWORD_HASHING_WORKERS = ENV.int("WORKERS", 4)
+    PASSWORD_HASHING_QUEUE_SIZE = ENV.int("QUEUE_SIZE", 64)
+
+with ENV.prefixed("AUTH_USER_CACHE_"):
+    AUTH_USER_CACHE_SIZE = ENV.int("SIZE", 1024)
+    AUTH_USER_CACHE_TTL = ENV.float("TTL", 60.0)
+
+TASK_LIST_CACHE_MAX_BYTES = ENV.int("TASK_LIST_CACHE_MAX_BYTES", 32 * 2 ** 20)
+
+with ENV.prefixed("SERVER_"):
+    SERVER_BIND = ENV.str("BIND", "0.0.0.0:8000")
+    SERVER_WORKERS = ENV.int("WORKERS", 0) or os.cpu_count() or 1
+    SERVER_PRELOAD = ENV.bool("PRELOAD", True)
+    SERVER_MAX_REQUESTS = ENV.int("MAX_REQUESTS", 10000)
+    SERVER_MAX_REQUESTS_JITTER = ENV.int("MAX_REQUESTS_JITTER", 1000)
+    SERVER_TIMEOUT = ENV.int("TIMEOUT", 60)
+    SERVER_GRACEFUL_TIMEOUT = ENV.int("GRACEFUL_TIMEOUT", 30)
+    SERVER_FORWARDED_ALLOW_IPS = ENV.str("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+with ENV.prefixed("LOG_"):
+    LOG_LEVEL = ENV.str("LEVEL", "DEBUG" if DEBUG_MODE else "INFO").upper()
+    LOG_LEVELS = parse_log_settings(ENV.str("LEVELS", ""), str.upper)
+    LOG_SAMPLING = parse_log_settings(ENV.str("SAMPLING", ""), float)
+    LOG_FILE = ENV.str("FILE", f"{BASE_DIR}/app/logs/{BASE_DIR.stem}-app.log")
+    LOG_RETENTION_DAYS = ENV.int("RETENTION_DAYS", 7)
 
-logger.add(
-    f"{BASE_DIR}/app/logs/{BASE_DIR.stem}-app.log",
-    format="{time} {level} {message}",
-    level="DEBUG",
-    rotation="1 day",
-    retention="7 days")
+log_filter = LogSampler(
+    default_level=logger.level(LOG_LEVEL).no,
+    levels={
+        name: logger.level(level).no for name, level in LOG_LEVELS.items()
+    },
+    sampling=LOG_SAMPLING)
+logger.remove()
+logger.add(sys.stderr, level=0, filter=log_filter, enqueue=True)
+if LOG_FILE:
+    logger.add(
+        DailyFileSink(LOG_FILE, retention_days=LOG_RETENTION_DAYS),
+        format=json_formatter,
+        level=0,
+        filter=log_filter,
+        enqueue=True)
@@ -1,25 +1,216 @@
 from asyncio import current_task
+from itertools import cycle
+from time import perf_counter
 
+from fastapi import Depends, Request
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
-    async_scoped_session, async_sessionmaker, create_async_engine
+    AsyncEngine,
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.config import (
+    DB_POOL_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_REPLICA_URLS,
+    DB_URL,
+    DEBUG_MODE,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHE_SIZE,
+    SQLITE_GROUP_COMMIT_MAX_SIZE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SINGLE_WRITER,
+    SQLITE_SYNCHRONOUS
 )
-from sqlalchemy.pool import NullPool
+from app.configuration.sqlite_writer import SQLiteWriter
+from app.utils.read_your_writes import wrote_recently
+
+
+class ObservablePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool which measures how long callers
+    wait to check out a connection
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            waited = perf_counter() - started_at
+            self.checkouts += 1
+            self.checkout_wait_total += waited
+            self.checkout_wait_max = max(self.checkout_wait_max, waited)
 
-from app.config import DB_URL, DEBUG_MODE
+    def stats(self):
+        return dict(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow(),
+            checkouts=self.checkouts,
+            checkout_timeouts=self.checkout_timeouts,
+            checkout_wait_total_seconds=self.checkout_wait_total,
+            checkout_wait_max_seconds=self.checkout_wait_max)
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Switches SQLite to WAL, so readers do not block the writer,
+    and makes connections wait for locks instead of failing at once
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in (
+            "journal_mode = WAL",
+            f"synchronous = {SQLITE_SYNCHRONOUS}",
+            f"busy_timeout = {SQLITE_BUSY_TIMEOUT}",
+            f"cache_size = {SQLITE_CACHE_SIZE}",
+            f"mmap_size = {SQLITE_MMAP_SIZE}"):
+        cursor.execute(f"PRAGMA {pragma}")
+
+    cursor.close()
 
 
 class DatabaseHelper:
+    """
+    Engines and sessions of the primary DB, which takes all writes,
+    and of optional read replicas used in turn by read-only routes
+    """
+
+    def __init__(
+            self,
+            db_url: str,
+            echo_mode: bool = False,
+            pool_size: int = DB_POOL_SIZE,
+            max_overflow: int = DB_POOL_MAX_OVERFLOW,
+            pool_recycle: int = DB_POOL_RECYCLE,
+            pool_pre_ping: bool = DB_POOL_PRE_PING,
+            pool_timeout: float = DB_POOL_TIMEOUT,
+            replica_urls: list[str] = DB_REPLICA_URLS,
+            sqlite_single_writer: bool = SQLITE_SINGLE_WRITER
+        ):
+        pool_options = dict(poolclass=NullPool)
+        if pool_size > 0:
+            pool_options = dict(
+                poolclass=ObservablePool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                pool_timeout=pool_timeout)
 
-    def __init__(self, db_url: str, echo_mode: bool = False):
         self.engine = create_async_engine(
-            url=db_url, echo=echo_mode, poolclass=NullPool
+            url=db_url, echo=echo_mode, **pool_options
         )
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
+        self.session_factory = self.__make_session_factory(self.engine)
+        self.replica_engines = [
+            create_async_engine(
+                url=replica_url, echo=echo_mode, **pool_options)
+            for replica_url in replica_urls
+        ]
+        self.sqlite_writer = None
+        if sqlite_single_writer and self.engine.dialect.name == "sqlite":
+            # writer has its own connection, so it is never starved
+            # by requests holding pool connections while waiting for it
+            self.sqlite_writer = SQLiteWriter(
+                create_async_engine(
+                    url=db_url,
+                    echo=echo_mode,
+                    poolclass=AsyncAdaptedQueuePool,
+                    pool_size=1,
+                    max_overflow=0),
+                max_group_size=SQLITE_GROUP_COMMIT_MAX_SIZE)
+
+        for engine in self.engines:
+            if engine.dialect.name == "sqlite":
+                event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+
+        self.read_session_dependency = (
+            self.__make_read_session_dependency())
+        self.__replica_session_factories = cycle([
+            self.__make_session_factory(engine)
+            for engine in self.replica_engines
+        ])
+
+    @staticmethod
+    def __make_session_factory(engine: AsyncEngine):
+        return async_sessionmaker(
+            bind=engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False)
 
+    @property
+    def engines(self):
+        engines = (self.engine, *self.replica_engines)
+        if self.sqlite_writer is not None:
+            engines += (self.sqlite_writer.engine,)
+
+        return engines
+
+    def get_read_session_factory(self, use_primary: bool = False):
+        """
+        Returns session factory of the next replica
+        or of the primary DB if there are no replicas
+        """
+        if use_primary or not self.replica_engines:
+            return self.session_factory
+
+        return next(self.__replica_session_factories)
+
+    async def run_write(self, session: AsyncSession, func, *args):
+        """
+        Runs `func(session, *args)` changing data. With the single
+        SQLite writer the call is queued to it and gets the writer's
+        session instead of `session`
+        """
+        if self.sqlite_writer is not None:
+            # returns connection of `session` to the pool while waiting
+            await session.close()
+            return await self.sqlite_writer.run(func, *args)
+
+        return await func(session, *args)
+
+    def dispose_after_fork(self):
+        """
+        Drops connections inherited from the parent process without
+        closing them, so a forked worker opens its own connections
+        and does not break the ones used by the parent
+        """
+        for engine in self.engines:
+            engine.sync_engine.dispose(close=False)
+
+    async def dispose(self):
+        for engine in self.engines:
+            await engine.dispose()
+
+    def get_pool_stats(self):
+        """Returns occupancy and checkout wait statistics of the pool"""
+        pool = self.engine.pool
+        if isinstance(pool, ObservablePool):
+            return pool.stats()
+
+        return dict(status=pool.status())
+
     def get_scoped_session(self):
         session = async_scoped_session(
             session_factory=self.session_factory,
@@ -29,8 +220,30 @@ class DatabaseHelper:
 
     async def scoped_session_dependency(self):
         session = self.get_scoped_session()
-        yield session
-        await session.close()
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    def __make_read_session_dependency(self):
+        async def read_session_dependency(
+                request: Request,
+                primary_session: AsyncSession = Depends(
+                    self.scoped_session_dependency)):
+            """
+            Session for read-only routes. Clients which have just
+            changed data read from the primary DB to see their changes.
+            Primary DB is read through the request-wide session, so
+            routes which also write do not take a second connection
+            """
+            if not self.replica_engines or wrote_recently(request):
+                yield primary_session
+                return
+
+            async with self.get_read_session_factory()() as session:
+                yield session
+
+        return read_session_dependency
 
 
 db_helper = DatabaseHelper(db_url=DB_URL, echo_mode=DEBUG_MODE)
@@ -0,0 +1,127 @@
+from hashlib import sha256
+from json import dumps
+
+from loguru import logger
+from sqlalchemy import Connection, delete, func, insert, select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.config import ROLE_PERMISSIONS, TASK_PRIORITY_LABELS, TASK_STATUSES
+from app.configuration.db_helper import db_helper
+from app.configuration.initial_db_data import insert_all_initial_db_data
+from app.core.crud.change_marker import CHANGE_MARKERS
+from app.core.models import Base, SchemaVersion
+from app.core.models.task_search import (
+    POSTGRESQL_TASK_SEARCH_DDL,
+    SQLITE_TASK_SEARCH_DDL,
+    create_task_search_index
+)
+
+SCHEMA_VERSION = "schema"
+MIGRATION_LOCK = "migration_lock"
+# Key of PostgreSQL advisory lock serializing creation of `schema_version`
+MIGRATION_ADVISORY_LOCK_KEY = 0x7461736B
+
+
+def calculate_schema_version(dialect: Dialect):
+    """
+    Fingerprints DDL of all tables and initial data,
+    so any change of models or seeds produces another version
+    """
+    ddl = [
+        str(CreateTable(table).compile(dialect=dialect))
+        for table in Base.metadata.sorted_tables
+    ] + [
+        str(CreateIndex(index).compile(dialect=dialect))
+        for table in Base.metadata.sorted_tables
+        for index in sorted(table.indexes, key=lambda index: index.name)
+    ]
+    ddl += (
+        SQLITE_TASK_SEARCH_DDL if dialect.name == "sqlite"
+        else POSTGRESQL_TASK_SEARCH_DDL)
+    seeds = dumps(
+        [ROLE_PERMISSIONS, TASK_PRIORITY_LABELS, TASK_STATUSES,
+         CHANGE_MARKERS],
+        sort_keys=True)
+
+    return sha256("\n".join((*ddl, seeds)).encode()).hexdigest()
+
+
+async def get_applied_schema_version(connection: AsyncConnection):
+    """Reads version applied to DB, `None` if DB is not initialized"""
+    try:
+        return await connection.scalar(
+            select(SchemaVersion.version)
+            .where(SchemaVersion.name == SCHEMA_VERSION))
+    except DBAPIError:
+        return None
+
+
+def create_missing_indexes(connection: Connection):
+    """
+    Creates declared indexes missing in DB. `create_all` builds indexes
+    only together with new tables, so indexes added to existing tables
+    would never appear otherwise
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+async def migrate(connection: AsyncConnection, version: str):
+    """
+    Creates missing tables and indexes and inserts initial data
+    in one transaction, then records applied `version`
+    """
+    await connection.run_sync(Base.metadata.create_all)
+    await connection.run_sync(create_missing_indexes)
+    await connection.run_sync(create_task_search_index)
+    async with AsyncSession(bind=connection) as session:
+        await insert_all_initial_db_data(session)
+
+    await connection.execute(
+        delete(SchemaVersion).where(SchemaVersion.name == SCHEMA_VERSION))
+    await connection.execute(
+        insert(SchemaVersion).values(name=SCHEMA_VERSION, version=version))
+
+
+@logger.catch(reraise=True)
+async def prepare_database():
+    """
+    Brings DB schema and initial data up to date.
+    When DB is current it costs one query. Otherwise only one process
+    migrates: others wait on the lock row and find DB current after it.
+    Returns `True` if this process has migrated DB
+    """
+    version = calculate_schema_version(db_helper.engine.dialect)
+    async with db_helper.engine.connect() as connection:
+        if await get_applied_schema_version(connection) == version:
+            return False
+
+    async with db_helper.engine.begin() as connection:
+        # concurrent `CREATE TABLE IF NOT EXISTS` of PostgreSQL may fail
+        # on unique violation in `pg_type`, so workers create it in turn
+        if connection.dialect.name == "postgresql":
+            await connection.execute(select(
+                func.pg_advisory_xact_lock(MIGRATION_ADVISORY_LOCK_KEY)))
+
+        await connection.execute(
+            CreateTable(SchemaVersion.__table__, if_not_exists=True))
+
+    async with db_helper.engine.begin() as connection:
+        # concurrent inserts of the same unique name wait
+        # until this transaction ends
+        await connection.execute(
+            insert(SchemaVersion).values(name=MIGRATION_LOCK, version=version))
+        if await get_applied_schema_version(connection) == version:
+            await connection.rollback()
+            return False
+
+        await migrate(connection, version)
+        await connection.execute(
+            delete(SchemaVersion).where(SchemaVersion.name == MIGRATION_LOCK))
+
+    logger.info(f"DB schema migrated to version {version[:12]}")
+    return True
@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import (
     ROLE_PERMISSIONS, TASK_PRIORITY_LABELS, TASK_STATUSES
 )
-from app.configuration.db_helper import db_helper
-from app.core.models import RolePermission, TaskPriority, TaskStatus
+from app.core.crud.change_marker import CHANGE_MARKERS
+from app.core.models import (
+    ChangeMarker, RolePermission, TaskPriority, TaskStatus
+)
 from app.core.schemas import (
     RolePermissionCreate, TaskPriorityCreate, TaskStatusCreate)
 
@@ -72,12 +74,26 @@ async def insert_task_statuses(session: AsyncSession):
 
 
 @logger.catch(reraise=True)
-async def insert_all_initial_db_data():
+async def insert_change_markers(session: AsyncSession):
+    """Add change markers of tables to DB"""
+    stmt = select(ChangeMarker.name)
+    existing_markers = {
+        row[0] for row in (await session.execute(stmt))
+    }
+    missing_markers = [
+        name for name in CHANGE_MARKERS if not name in existing_markers
+    ]
+    if missing_markers:
+        session.add_all(ChangeMarker(name=name) for name in missing_markers)
+        await session.commit()
+
+
+@logger.catch(reraise=True)
+async def insert_all_initial_db_data(session: AsyncSession):
     """
     Fill DB with initial data for correct functioning of app
     """
-    session = db_helper.get_scoped_session()
     await insert_role_permissions(session)
     await insert_task_priorities(session)
     await insert_task_statuses(session)
-    await session.close()
+    await insert_change_markers(session)
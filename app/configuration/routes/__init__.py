@@ -1,5 +1,12 @@
+from app.config import METRICS_ENABLED
 from app.configuration.routes.routes import Routes
-from app.core.routes import auth, base, task, user
+from app.core.routes import auth, base, metrics, reference, task, user
 
 __routes__ = Routes(
-    routers=(auth.router, base.router, task.router, user.router))
+    routers=(
+        auth.router,
+        base.router,
+        reference.router,
+        task.router,
+        user.router,
+        *((metrics.router,) if METRICS_ENABLED else ())))
@@ -1,11 +1,31 @@
+from asyncio import create_task, gather
 from contextlib import asynccontextmanager
+from time import perf_counter
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import http_exception_handler
+from loguru import logger
+from starlette.exceptions import HTTPException
 
+from app.config import (
+    DB_READ_YOUR_WRITES_WINDOW,
+    METRICS_ENABLED,
+    REFERENCE_DATA_POLL_INTERVAL,
+    SQL_INSTRUMENTATION_ENABLED,
+    SQL_INSTRUMENTATION_QUERY_BUDGET
+)
 from app.configuration.db_helper import db_helper
-from app.configuration.initial_db_data import insert_all_initial_db_data
+from app.configuration.db_schema import prepare_database
 from app.configuration.routes import __routes__
-from app.core.models import Base
+from app.core.crud.reference_data import reference_data
+from app.core.crud.user import invalidate_auth_user_cache
+from app.utils.auth_jwt import password_hashing_executor
+from app.utils.email_sender import mail_worker, task_status_digest
+from app.utils.metrics import MetricsMiddleware
+from app.utils.read_your_writes import ReadYourWritesMiddleware
+from app.utils.sql_instrumentation import (
+    SQLInstrumentationMiddleware, instrument_engine
+)
 
 
 class Server:
@@ -13,6 +33,8 @@ class Server:
     def __init__(self, app: FastAPI):
         self.__app = app
         self.__register_routes(app)
+        self.__register_middlewares(app)
+        self.__register_exception_handlers(app)
 
     def get_app(self):
         return self.__app
@@ -21,12 +43,82 @@ class Server:
     def __register_routes(app: FastAPI):
         __routes__.register_routers(app)
 
+    @staticmethod
+    def __register_middlewares(app: FastAPI):
+        if SQL_INSTRUMENTATION_ENABLED:
+            for engine in db_helper.engines:
+                instrument_engine(engine.sync_engine)
+            app.add_middleware(
+                SQLInstrumentationMiddleware,
+                query_budget=SQL_INSTRUMENTATION_QUERY_BUDGET)
+
+        if db_helper.replica_engines:
+            app.add_middleware(
+                ReadYourWritesMiddleware,
+                window=DB_READ_YOUR_WRITES_WINDOW)
+
+        if METRICS_ENABLED:
+            app.add_middleware(MetricsMiddleware)
+
+    @staticmethod
+    def __register_exception_handlers(app: FastAPI):
+        app.add_exception_handler(HTTPException, log_http_exception)
+
+
+async def log_http_exception(request: Request, exc: HTTPException):
+    """
+    Logs expected HTTP errors as one short line without traceback
+    and responds with them as usual. Non-error statuses raised as
+    exceptions (e.g. `304 Not Modified` of polling clients) are
+    logged at DEBUG level only
+    """
+    level = (
+        "DEBUG" if exc.status_code < 400 else
+        "INFO" if exc.status_code < 500 else "WARNING")
+    logger.bind(
+        method=request.method,
+        path=request.url.path,
+        status=exc.status_code
+    ).log(
+        level,
+        f"{request.method} {request.url.path} "
+        f"responded {exc.status_code}: {exc.detail}")
+
+    return await http_exception_handler(request, exc)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with db_helper.engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    started_at = perf_counter()
+    migrated = await prepare_database()
+    async with db_helper.session_factory() as session:
+        await reference_data.refresh(session)
+
+    if db_helper.sqlite_writer is not None:
+        await db_helper.sqlite_writer.start()
 
-    await insert_all_initial_db_data()
+    await mail_worker.start()
+    background_tasks = list()
+    if REFERENCE_DATA_POLL_INTERVAL > 0:
+        background_tasks.append(create_task(reference_data.watch(
+            db_helper.session_factory,
+            REFERENCE_DATA_POLL_INTERVAL,
+            on_change=invalidate_auth_user_cache)))
+
+    logger.info(
+        f"Startup completed in {perf_counter() - started_at:.3f} seconds"
+        f" ({'DB migrated' if migrated else 'DB schema is up to date'})")
     yield
-    await db_helper.engine.dispose()
+    for task in background_tasks:
+        task.cancel()
+
+    await gather(*background_tasks, return_exceptions=True)
+    task_status_digest.flush_all()
+    await mail_worker.stop()
+    if db_helper.sqlite_writer is not None:
+        await db_helper.sqlite_writer.stop()
+
+    logger.info(f"DB pool stats: {db_helper.get_pool_stats()}")
+    await db_helper.dispose()
+    password_hashing_executor.shutdown()
+    await logger.complete()
@@ -0,0 +1,122 @@
+from asyncio import (
+    CancelledError, Queue, create_task, gather, get_running_loop
+)
+from contextvars import copy_context
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+
+class SQLiteWriter:
+    """
+    Single writer of SQLite DB. Write jobs of concurrent requests run
+    one by one on one connection, each in its own SAVEPOINT, and all
+    jobs queued meanwhile are committed by one COMMIT (group commit).
+    A failed job rolls back only its SAVEPOINT
+    """
+
+    def __init__(self, engine: AsyncEngine, max_group_size: int = 100):
+        self.engine = engine
+        self.max_group_size = max_group_size
+        self.queue = Queue()
+        self.jobs = 0
+        self.commits = 0
+        self.__worker = None
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs `func(session, *args, **kwargs)` by the writer
+        and returns its result once the changes are committed
+        """
+        # job runs in the context of the caller, so request-scoped
+        # context variables (e.g. SQL statistics) see its queries
+        job = (
+            get_running_loop().create_future(),
+            copy_context(),
+            func,
+            args,
+            kwargs)
+        if self.__worker is None:
+            await self.__commit_group([job])
+        else:
+            self.queue.put_nowait(job)
+
+        return await job[0]
+
+    async def start(self):
+        # queue is bound to the event loop of its first waiter,
+        # so every start (e.g. lifespan of a new app) gets its own
+        self.queue = Queue()
+        self.__worker = create_task(self.__work())
+
+    async def stop(self):
+        """Waits until queued jobs are committed, then stops the writer"""
+        await self.queue.join()
+        if self.__worker is not None:
+            self.__worker.cancel()
+            await gather(self.__worker, return_exceptions=True)
+            self.__worker = None
+
+    def stats(self):
+        return dict(
+            queued=self.queue.qsize(), jobs=self.jobs, commits=self.commits)
+
+    async def __work(self):
+        while True:
+            group = [await self.queue.get()]
+            while len(group) < self.max_group_size and not self.queue.empty():
+                group.append(self.queue.get_nowait())
+
+            try:
+                await self.__commit_group(group)
+            finally:
+                for _ in group:
+                    self.queue.task_done()
+
+    async def __commit_group(self, group: list):
+        results = list()
+        try:
+            async with self.engine.connect() as connection:
+                async with connection.begin():
+                    # takes the write lock at once, so the transaction
+                    # waits for other processes instead of failing later
+                    await connection.exec_driver_sql("BEGIN IMMEDIATE")
+                    for _, context, func, args, kwargs in group:
+                        results.append(await context.run(
+                            create_task,
+                            self.__run_job(connection, func, args, kwargs)))
+
+        except CancelledError:
+            raise
+        except Exception as error:
+            logger.opt(exception=error).error(
+                f"Group commit of {len(group)} write jobs failed")
+            results = [(None, error)] * len(group)
+        else:
+            self.jobs += len(group)
+            self.commits += 1
+
+        for (future, *_), (result, error) in zip(group, results):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    @staticmethod
+    async def __run_job(
+            connection: AsyncConnection, func, args: tuple, kwargs: dict
+        ):
+        # commit of the session only releases its SAVEPOINT,
+        # closing it without commit rolls back to the SAVEPOINT
+        async with AsyncSession(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                autoflush=False,
+                expire_on_commit=False) as session:
+            try:
+                return await func(session, *args, **kwargs), None
+            except Exception as error:
+                return None, error
+
@@ -0,0 +1,30 @@
+from loguru import logger
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import ChangeMarker
+
+TASK_CHANGE_MARKER = "task"
+REFERENCE_CHANGE_MARKER = "reference"
+CHANGE_MARKERS = (TASK_CHANGE_MARKER, REFERENCE_CHANGE_MARKER)
+
+
+@logger.catch(reraise=True)
+async def bump_change_marker(session: AsyncSession, name: str):
+    """
+    Increments version of the marker within the current transaction,
+    so it is committed together with the changes it marks
+    """
+    await session.execute(
+        update(ChangeMarker)
+        .where(ChangeMarker.name == name)
+        .values(version=ChangeMarker.version + 1)
+        .execution_options(synchronize_session=False))
+
+
+@logger.catch(reraise=True)
+async def get_change_marker(session: AsyncSession, name: str):
+    """Retrieves current version of the marker from DB"""
+    return await session.scalar(
+        select(ChangeMarker.version).where(ChangeMarker.name == name)
+    ) or 0
@@ -0,0 +1,112 @@
+from asyncio import sleep
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.crud.change_marker import (
+    REFERENCE_CHANGE_MARKER, get_change_marker
+)
+from app.core.models import RolePermission, TaskPriority, TaskStatus
+from app.core.schemas import (
+    RolePermissionSchema, TaskPrioritySchema, TaskStatusSchema
+)
+
+
+class ReferenceDataRegistry:
+    """
+    In-memory copy of rarely changed tables
+    (task statuses, task priorities and role permissions)
+    which resolves their names without querying DB.
+    Every process keeps its own copy, `version` of the reference
+    change marker shows whether the copy is outdated
+    """
+
+    def __init__(self):
+        self.statuses: dict[str, TaskStatusSchema] = dict()
+        self.priorities: dict[str, TaskPrioritySchema] = dict()
+        self.roles: dict[str, RolePermissionSchema] = dict()
+        self.version = None
+
+    @logger.catch(reraise=True)
+    async def refresh(self, session: AsyncSession):
+        """Reloads all reference tables from DB"""
+        # the marker is read first, so a change made during loading
+        # is loaded again by the next check
+        version = await get_change_marker(session, REFERENCE_CHANGE_MARKER)
+        statuses = (await session.scalars(
+            select(TaskStatus).order_by(TaskStatus.id))).all()
+        priorities = (await session.scalars(
+            select(TaskPriority).order_by(TaskPriority.importance_level)
+        )).all()
+        roles = (await session.scalars(
+            select(RolePermission).order_by(RolePermission.id))).all()
+
+        self.statuses = {
+            row.name.lower(): TaskStatusSchema.model_validate(
+                row, from_attributes=True)
+            for row in statuses
+        }
+        self.priorities = {
+            row.name.lower(): TaskPrioritySchema.model_validate(
+                row, from_attributes=True)
+            for row in priorities
+        }
+        self.roles = {
+            row.position.lower(): RolePermissionSchema.model_validate(
+                row, from_attributes=True)
+            for row in roles
+        }
+        self.version = version
+        logger.info(
+            f"Reference data loaded: {len(self.statuses)} statuses, "
+            f"{len(self.priorities)} priorities, {len(self.roles)} roles")
+
+    async def refresh_if_changed(self, session: AsyncSession):
+        """
+        Reloads reference tables if they were changed since the last
+        loading. Returns `True` if they were reloaded
+        """
+        version = await get_change_marker(session, REFERENCE_CHANGE_MARKER)
+        if version == self.version:
+            return False
+
+        await self.refresh(session)
+        return True
+
+    async def watch(
+            self,
+            session_factory: async_sessionmaker,
+            interval: float,
+            on_change=None
+        ):
+        """
+        Checks every `interval` seconds whether another process
+        has changed reference data and reloads it, calling `on_change`
+        """
+        while True:
+            await sleep(interval)
+            try:
+                async with session_factory() as session:
+                    if await self.refresh_if_changed(session) and on_change:
+                        on_change()
+
+            except Exception:
+                logger.exception("Reference data check failed")
+
+    def get_status(self, name: str):
+        return self.statuses.get(name.lower())
+
+    def get_priority_by_id(self, priority_id: int):
+        return next(
+            (
+                priority for priority in self.priorities.values()
+                if priority.id == priority_id
+            ),
+            None)
+
+    def get_role(self, position: str):
+        return self.roles.get(position.lower())
+
+
+reference_data = ReferenceDataRegistry()
@@ -4,16 +4,21 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import ROLE_PERMISSIONS
+from app.core.crud.reference_data import reference_data
 from app.core.models import RolePermission
 from app.core.schemas import RolePermissionSchema
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 async def get_role_permission(session: AsyncSession, role_name: str):
     """
-    Retrieves record about role permission from database
-    using specified `role_name`
+    Retrieves record about role permission from reference data registry
+    or, if it is missing there, from database using specified `role_name`
     """
+    role_permission = reference_data.get_role(role_name)
+    if role_permission:
+        return role_permission
+
     role_permission_row = await session.scalar(
         select(RolePermission).where(
             func.lower(RolePermission.position) == role_name.lower())
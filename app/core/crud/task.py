@@ -1,48 +1,257 @@
-from fastapi import HTTPException, status
+from re import findall
+from typing import Literal
+
+from fastapi import HTTPException, Query, status
 from loguru import logger
-from sqlalchemy import select, func, update
+from sqlalchemy import (
+    delete, false, func, insert, or_, select, tuple_, update
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import aliased, joinedload, selectinload
+
+from app.config import (
+    TASK_LIST_CACHE_MAX_BYTES, TASK_PRIORITY_LABELS, TASK_STATUSES
+)
+from app.core.crud.change_marker import (
+    TASK_CHANGE_MARKER, bump_change_marker
+)
+from app.core.crud.reference_data import reference_data
+from app.core.crud.user import get_users_map_by_emails
+from app.core.models import (
+    Task,
+    TaskPriority,
+    TaskStatus,
+    User,
+    task_user_association_table
+)
+from app.core.models.task_search import task_fts, task_search_condition
+from app.core.schemas import (
+    TaskBulkCreateResult,
+    TaskBulkStatusChangeResult,
+    TaskCreate,
+    TaskFilter,
+    TaskPrioritySchema,
+    TaskStatusSchema,
+    TaskSummarySchema,
+    TaskUpdate,
+    UserSchema
+)
+from app.utils.cache import SizedLRUCache
+from app.utils.pagination import (
+    decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+)
+
+ASSIGNABLE_ROLES = {"Project Manager", "Developer"}
+TASK_PROJECTION_FIELDS = tuple(TaskSummarySchema.model_fields)
+TASK_SUMMARY_VIEW_FIELDS = (
+    "id",
+    "title",
+    "status",
+    "priority",
+    "responsible_person",
+    "created_at",
+    "deadline"
+)
+task_list_cache = SizedLRUCache(TASK_LIST_CACHE_MAX_BYTES)
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def mark_tasks_changed(session: AsyncSession):
+    """
+    Bumps tasks change marker within the current transaction
+    and drops cached task listings of this process
+    """
+    await bump_change_marker(session, TASK_CHANGE_MARKER)
+    task_list_cache.clear()
+
+
+def find_assignment_errors(
+        task_in: TaskCreate, users_by_email: dict[str, User]
+    ):
+    """
+    Checks that all users assigned to `task_in` exist in `users_by_email`
+    and may be assigned to a task. Returns `(status code, error text)`
+    or `None`. Shared by single and bulk creation of tasks
+    """
+    not_finded_emails = [
+        email for email in dict.fromkeys(
+            (task_in.responsible_person, *task_in.performers))
+        if email not in users_by_email
+    ]
+    if not_finded_emails:
+        plural = "s" if len(not_finded_emails) > 1 else ""
+        return (
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            f"User{plural} with email{plural} "
+            f"«{'», «'.join(not_finded_emails)}» not found")
 
-from app.core.crud.user import get_users_by_emails
-from app.core.models import Task, TaskStatus, User
-from app.core.schemas import TaskCreate, TaskUpdate, UserSchema
+    for position_label, emails in (
+            ("responsible_person", (task_in.responsible_person,)),
+            ("performers", dict.fromkeys(task_in.performers))):
+        not_allowed_users = [
+            users_by_email[email] for email in emails
+            if users_by_email[email].role is None
+            or not users_by_email[email].role.position in ASSIGNABLE_ROLES
+        ]
+        if not_allowed_users:
+            return (
+                status.HTTP_403_FORBIDDEN,
+                ", ".join(map(str, not_allowed_users)) +
+                f" cannot be assigned to a task as {position_label}. "
+                f"Only «{'», «'.join(ASSIGNABLE_ROLES)}» roles "
+                f"available for {position_label}.")
 
 
-@logger.catch(reraise=True)
-async def check_roles_of_assigned_users(
-        users: list[UserSchema],
-        allowed_roles: set[str],
-        position_label: str,
-        session: AsyncSession
+@logger.catch(exclude=HTTPException, reraise=True)
+def validate_task_filters(
+        status: str | None = Query(
+            None,
+            description=f"One of: «{'», «'.join(TASK_STATUSES)}»"),
+        priority: str | None = Query(
+            None,
+            description=(
+                "One of: "
+                f"«{'», «'.join(TASK_PRIORITY_LABELS.values())}»")),
+        responsible_person: str | None = Query(
+            None, description="Email of responsible person"),
+        performer: str | None = Query(
+            None, description="Email of one of performers"),
+        created_by: str | None = Query(
+            None, description="Email of task creator"),
+        deadline_from: str | None = Query(
+            None, examples=["01.01.2025 00:00"]),
+        deadline_to: str | None = Query(
+            None, examples=["31.12.2025 23:59"])
     ):
-    """Compares `users` positions for compliance with `allowed roles`"""
-    not_allowed_users = tuple(filter(
-        lambda user: not user.role.position in allowed_roles, users
+    """Validates task listing filters entered by user"""
+    return TaskFilter(
+        status=status,
+        priority=priority,
+        responsible_person=responsible_person,
+        performer=performer,
+        created_by=created_by,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to)
+
+
+def parse_task_fields(fields: str):
+    """
+    Splits comma-separated task fields entered by user
+    or raises an exception about unknown fields
+    """
+    requested_fields = tuple(dict.fromkeys(
+        field.strip() for field in fields.split(",") if field.strip()
     ))
-    if not_allowed_users:
-        await session.close()
+    unknown_fields = [
+        field for field in requested_fields
+        if field not in TASK_PROJECTION_FIELDS
+    ]
+    if unknown_fields:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=(
-                ", ".join(map(str, not_allowed_users)) +
-                f" cannot be assigned to a task as {position_label}. "
-                f"Only «{'», «'.join(allowed_roles)}» roles "
-                f"available for {position_label}."))
+                f"Unknown task fields «{'», «'.join(unknown_fields)}». "
+                f"Available: «{'», «'.join(TASK_PROJECTION_FIELDS)}»"))
 
-    return users
+    return requested_fields
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
+def validate_task_fields(
+        view: Literal["full", "summary"] = Query(
+            "full",
+            description=(
+                "`summary` returns flat tasks with "
+                f"«{'», «'.join(TASK_SUMMARY_VIEW_FIELDS)}» fields")),
+        fields: str | None = Query(
+            None,
+            description=(
+                "Comma-separated fields of flat tasks to return, one of: "
+                f"«{'», «'.join(TASK_PROJECTION_FIELDS)}»"))
+    ):
+    """
+    Validates task fields requested by user.
+    Returns `None` if full tasks are requested
+    """
+    if fields:
+        return parse_task_fields(fields)
+
+    if view == "summary":
+        return TASK_SUMMARY_VIEW_FIELDS
+
+    return None
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def validate_search_fields(
+        fields: str | None = Query(
+            None,
+            description=(
+                "Comma-separated fields of found tasks to return, one of: "
+                f"«{'», «'.join(TASK_PROJECTION_FIELDS)}»"))
+    ):
+    """Validates fields of found tasks, summary fields by default"""
+    return parse_task_fields(fields) if fields else TASK_SUMMARY_VIEW_FIELDS
+
+
+def apply_task_filters(stmt, filters: TaskFilter | None):
+    """Adds SQL conditions matching specified `filters` to `stmt`"""
+    if filters is None:
+        return stmt
+
+    if filters.status:
+        task_status = reference_data.get_status(filters.status)
+        stmt = stmt.where(Task.status_id == (
+            task_status.id if task_status else
+            select(TaskStatus.id).where(
+                func.lower(TaskStatus.name) == filters.status.lower()
+            ).scalar_subquery()))
+
+    if filters.priority:
+        stmt = stmt.where(Task.priority_id == filters.priority)
+
+    if filters.responsible_person:
+        stmt = stmt.where(
+            Task.responsible_person_id == select(User.id).where(
+                User.email == filters.responsible_person
+            ).scalar_subquery())
+
+    if filters.created_by:
+        stmt = stmt.where(
+            Task.created_by_id == select(User.id).where(
+                User.email == filters.created_by
+            ).scalar_subquery())
+
+    if filters.performer:
+        stmt = stmt.where(
+            Task.performers.any(User.email == filters.performer))
+
+    if filters.deadline_from:
+        stmt = stmt.where(Task.deadline >= filters.deadline_from)
+
+    if filters.deadline_to:
+        stmt = stmt.where(Task.deadline <= filters.deadline_to)
+
+    return stmt
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
 async def get_task_status_id(session: AsyncSession, status: str):
-    """Retrieves task status ID from DB using specified `status` name"""
+    """
+    Retrieves task status ID from reference data registry
+    or, if it is missing there, from DB using specified `status` name
+    """
+    task_status = reference_data.get_status(status)
+    if task_status:
+        return task_status.id
+
     stmt = select(TaskStatus.id).where(
         func.lower(TaskStatus.name) == status.lower())
 
     return await session.scalar(stmt)
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 async def get_task_by_id(session: AsyncSession, task_id: id):
     """Retrieves record about task from DB using specified `task id`"""
     stmt = (
@@ -71,40 +280,54 @@ async def get_task_by_id(session: AsyncSession, task_id: id):
     return task_row
 
 
-@logger.catch(reraise=True)
-async def update_task_details(
-        session: AsyncSession, task_id: int, task_in: TaskUpdate
+@logger.catch(exclude=HTTPException, reraise=True)
+async def get_task_reference_data(
+        session: AsyncSession, status_name: str, priority_id: int
     ):
     """
-    Updates task data about responsible person, performers and
-    then commit changes in database
+    Retrieves status and priority of a task from reference data registry
+    or, if they are missing there, from DB
     """
-    task_to_update = await get_task_by_id(session, task_id)
-    if task_in.responsible_person:
-        task_to_update.responsible_person = (
-            await check_roles_of_assigned_users(
-                await get_users_by_emails(
-                    session, [task_in.responsible_person]
-                ),
-                {"Project Manager", "Developer"},
-                "responsible_person",
-                session
-            )
-        )[0]
+    task_status = reference_data.get_status(status_name)
+    if task_status is None:
+        task_status = TaskStatusSchema.model_validate(
+            await session.scalar(select(TaskStatus).where(
+                func.lower(TaskStatus.name) == status_name.lower())),
+            from_attributes=True)
 
-    if task_in.performers:
-        task_to_update.performers = await check_roles_of_assigned_users(
-            await get_users_by_emails(session, task_in.performers),
-            {"Project Manager", "Developer"},
-            "performers",
-            session)
+    task_priority = reference_data.get_priority_by_id(priority_id)
+    if task_priority is None:
+        task_priority = TaskPrioritySchema.model_validate(
+            await session.get(TaskPriority, priority_id),
+            from_attributes=True)
 
-    await session.commit()
+    return task_status, task_priority
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def resolve_assigned_users(
+        session: AsyncSession,
+        task_in: TaskCreate,
+        users_by_email: dict[str, User]
+    ):
+    """
+    Picks responsible person and performers of `task_in`
+    from `users_by_email` and checks their roles
+    """
+    error = find_assignment_errors(task_in, users_by_email)
+    if error is not None:
+        await session.close()
+        raise HTTPException(status_code=error[0], detail=error[1])
+
+    responsible_person = users_by_email[task_in.responsible_person]
+    performers = [
+        users_by_email[email] for email in dict.fromkeys(task_in.performers)
+    ]
 
-    return task_to_update
+    return responsible_person, performers
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 async def generate_task(
         session: AsyncSession,
         task_in: TaskCreate,
@@ -113,44 +336,211 @@ async def generate_task(
     """
     Validates task data from user,
     calculates remaining fields and generates the task,
-    after that saving it in database
+    after that saving it in database.
+
+    DB round-trips: SELECT of all assigned users and the creator,
+    INSERT of the task, INSERT of performers (if any),
+    UPDATE of the change marker, COMMIT
     """
+    stmt = (
+        select(User).options(joinedload(User.role))
+        .where(or_(
+            User.email.in_(
+                (task_in.responsible_person, *task_in.performers)),
+            User.id == created_by.id)))
+
+    users = (await session.scalars(stmt)).all()
+    responsible_person, performers = await resolve_assigned_users(
+        session, task_in, {user.email: user for user in users}
+    )
+    task_status, task_priority = await get_task_reference_data(
+        session, task_in.status, task_in.priority
+    )
     created_task = Task(
         title=task_in.title,
         description=task_in.description,
-        status_id=(
-            await get_task_status_id(session, task_in.status)
-        ),
+        responsible_person=responsible_person,
+        performers=performers,
+        status_id=task_status.id,
         priority_id=task_in.priority,
         created_by_id=created_by.id,
         deadline=task_in.deadline
     )
     session.add(created_task)
-    await session.flush()
+    await mark_tasks_changed(session)
+    await session.commit()
 
-    return await update_task_details(session, created_task.id, task_in)
+    return dict(
+        id=created_task.id,
+        title=created_task.title,
+        description=created_task.description,
+        responsible_person=responsible_person,
+        performers=performers,
+        status=task_status,
+        priority=task_priority,
+        created_at=created_task.created_at,
+        created_by=next(
+            (user for user in users if user.id == created_by.id),
+            created_by),
+        deadline=created_task.deadline)
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
+async def generate_tasks_bulk(
+        session: AsyncSession,
+        tasks_in: list[TaskCreate],
+        created_by: UserSchema
+    ):
+    """
+    Validates the whole batch of tasks, resolving all assigned users
+    in one query, then inserts valid tasks and their performers
+    in one transaction. Returns result for every task of the batch
+    """
+    users_by_email = await get_users_map_by_emails(
+        session,
+        {
+            email for task_in in tasks_in
+            for email in (task_in.responsible_person, *task_in.performers)
+        }
+    )
+    results = [TaskBulkCreateResult(index=i) for i in range(len(tasks_in))]
+    valid_tasks = list()
+    for result, task_in in zip(results, tasks_in):
+        error = find_assignment_errors(task_in, users_by_email)
+        if error is None:
+            valid_tasks.append((result, task_in))
+        else:
+            result.error = error[1]
+
+    if not valid_tasks:
+        return results
+
+    created_ids = (await session.scalars(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True),
+        [
+            dict(
+                title=task_in.title,
+                description=task_in.description,
+                responsible_person_id=(
+                    users_by_email[task_in.responsible_person].id
+                ),
+                status_id=await get_task_status_id(session, task_in.status),
+                priority_id=task_in.priority,
+                created_by_id=created_by.id,
+                deadline=task_in.deadline)
+            for _, task_in in valid_tasks
+        ]
+    )).all()
+
+    performers_rows = list()
+    for task_id, (result, task_in) in zip(created_ids, valid_tasks):
+        result.id = task_id
+        performers_rows.extend(
+            dict(task_id=task_id, user_id=users_by_email[email].id)
+            for email in dict.fromkeys(task_in.performers)
+        )
+
+    if performers_rows:
+        await session.execute(
+            insert(task_user_association_table), performers_rows)
+
+    await mark_tasks_changed(session)
+    await session.commit()
+
+    return results
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
 async def update_task(
         session: AsyncSession, task_in: TaskUpdate
     ):
-    """Updates task fields based on user input and saves changes to DB"""
-    await session.execute(
+    """
+    Updates task fields based on user input and saves changes to DB.
+    Performers stay unchanged if `task_in` has no performers.
+
+    DB round-trips: SELECT of all assigned users and the creator,
+    UPDATE of the task, DELETE and INSERT of performers (if specified),
+    UPDATE of the change marker, COMMIT
+    """
+    created_by_id = (
+        select(Task.created_by_id).where(Task.id == task_in.id)
+        .scalar_subquery()
+    )
+    current_performers_ids = (
+        select(task_user_association_table.c.user_id)
+        .where(task_user_association_table.c.task_id == task_in.id)
+    )
+    is_current_performer = (
+        User.id.in_(current_performers_ids) if not task_in.performers
+        else false()
+    )
+    stmt = (
+        select(User, User.id == created_by_id, is_current_performer)
+        .options(joinedload(User.role))
+        .where(or_(
+            User.email.in_(
+                (task_in.responsible_person, *task_in.performers)),
+            User.id == created_by_id,
+            is_current_performer)))
+
+    users_rows = (await session.execute(stmt)).all()
+    created_by = next(
+        (user for user, is_creator, _ in users_rows if is_creator), None
+    )
+    if created_by is None:
+        await session.close()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Task with ID = «{task_in.id}» not found")
+
+    responsible_person, performers = await resolve_assigned_users(
+        session, task_in, {user.email: user for user, _, _ in users_rows}
+    )
+    if not task_in.performers:
+        performers = [
+            user for user, _, is_performer in users_rows if is_performer
+        ]
+
+    task_status, task_priority = await get_task_reference_data(
+        session, task_in.status, task_in.priority
+    )
+    created_at = await session.scalar(
         update(Task).where(Task.id == task_in.id)
         .values(
             title=task_in.title,
             description=task_in.description,
-            status_id=(
-                await get_task_status_id(session, task_in.status)
-            ),
+            responsible_person_id=responsible_person.id,
+            status_id=task_status.id,
             priority_id=task_in.priority,
-            deadline=task_in.deadline))
+            deadline=task_in.deadline)
+        .returning(Task.created_at)
+        .execution_options(synchronize_session=False))
+
+    if task_in.performers:
+        await session.execute(
+            delete(task_user_association_table)
+            .where(task_user_association_table.c.task_id == task_in.id))
+        await session.execute(
+            insert(task_user_association_table),
+            [dict(task_id=task_in.id, user_id=user.id) for user in performers])
 
-    return await update_task_details(session, task_in.id, task_in)
+    await mark_tasks_changed(session)
+    await session.commit()
+
+    return dict(
+        id=task_in.id,
+        title=task_in.title,
+        description=task_in.description,
+        responsible_person=responsible_person,
+        performers=performers,
+        status=task_status,
+        priority=task_priority,
+        created_at=created_at,
+        created_by=created_by,
+        deadline=task_in.deadline)
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 async def update_task_status(
         session: AsyncSession, task_id: int, status_name: str
     ):
@@ -159,25 +549,70 @@ async def update_task_status(
     new_status_id = await get_task_status_id(session, status_name)
     if task_to_update.status_id != new_status_id:
         task_to_update.status_id = new_status_id
+        await mark_tasks_changed(session)
         await session.commit()
         task_to_update.status.name = status_name
 
         return task_to_update
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
+async def update_tasks_status_bulk(
+        session: AsyncSession, task_ids: list[int], status_name: str
+    ):
+    """
+    Updates status of all specified tasks with one statement
+    and saves changes to DB. Returns result for every task ID
+    and the changed tasks with their responsible persons
+    """
+    new_status_id = await get_task_status_id(session, status_name)
+    stmt = (
+        select(Task)
+        .options(joinedload(Task.responsible_person))
+        .where(Task.id.in_(task_ids)))
+
+    tasks_by_id = {task.id: task for task in await session.scalars(stmt)}
+    changed_tasks = [
+        task for task in tasks_by_id.values()
+        if task.status_id != new_status_id
+    ]
+    results = [
+        TaskBulkStatusChangeResult(
+            task_id=task_id,
+            result=(
+                "not_found" if task_id not in tasks_by_id else
+                "unchanged" if tasks_by_id[task_id].status_id == new_status_id
+                else "changed"))
+        for task_id in dict.fromkeys(task_ids)
+    ]
+    if changed_tasks:
+        await session.execute(
+            update(Task)
+            .where(Task.id.in_(task.id for task in changed_tasks))
+            .values(status_id=new_status_id)
+            .execution_options(synchronize_session=False))
+        await mark_tasks_changed(session)
+        await session.commit()
+
+    return results, changed_tasks
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
 async def delete_task(session: AsyncSession, task_id):
     """Deletes task from DB by specified ID and returns its object"""
     task_schema = await get_task_by_id(session, task_id)
     await session.delete(task_schema)
+    await mark_tasks_changed(session)
     await session.commit()
 
     return task_schema
 
 
-@logger.catch(reraise=True)
-async def get_all_tasks(session: AsyncSession):
-    """Executes query to retrieve all tasks from database"""
+@logger.catch(exclude=HTTPException, reraise=True)
+async def get_all_tasks(
+        session: AsyncSession, filters: TaskFilter | None = None
+    ):
+    """Executes query to retrieve all tasks matching `filters` from DB"""
     stmt = (
         select(Task)
         .options(
@@ -196,4 +631,213 @@ async def get_all_tasks(session: AsyncSession):
         )
         .order_by(Task.created_at))
 
+    stmt = apply_task_filters(stmt, filters)
+
     return (await session.scalars(stmt)).all()
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def get_tasks_page(
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        filters: TaskFilter | None = None
+    ):
+    """
+    Executes keyset query to retrieve up to `limit` tasks matching
+    `filters` ordered by `(created_at, id)` after position of `cursor`.
+    Returns tasks and cursor of the next page (`None` on the last page)
+    """
+    stmt = (
+        select(Task)
+        .options(
+            selectinload(Task.performers)
+            .joinedload(User.role)
+        )
+        .options(
+            joinedload(Task.responsible_person)
+            .joinedload(User.role)
+        )
+        .options(joinedload(Task.status))
+        .options(joinedload(Task.priority))
+        .options(
+            joinedload(Task.created_by)
+            .joinedload(User.role)
+        )
+        .order_by(Task.created_at, Task.id)
+        .limit(limit + 1))
+
+    if cursor:
+        stmt = stmt.where(
+            tuple_(Task.created_at, Task.id) > decode_cursor(cursor))
+
+    stmt = apply_task_filters(stmt, filters)
+    tasks = (await session.scalars(stmt)).all()
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+
+    return tasks, next_cursor
+
+
+def select_task_columns(fields: tuple[str, ...]):
+    """
+    Builds query of flat task rows with only requested `fields`,
+    joining only tables needed for them.
+    Performers are aggregated into one string separated by «;»
+    """
+    columns = dict(
+        id=Task.id,
+        title=Task.title,
+        description=Task.description,
+        created_at=Task.created_at,
+        deadline=Task.deadline)
+    joins = list()
+
+    if "status" in fields:
+        columns["status"] = TaskStatus.name.label("status")
+        joins.append((TaskStatus, Task.status_id == TaskStatus.id))
+
+    if "priority" in fields:
+        columns["priority"] = TaskPriority.name.label("priority")
+        joins.append((TaskPriority, Task.priority_id == TaskPriority.id))
+
+    for field, foreign_key in (
+            ("responsible_person", Task.responsible_person_id),
+            ("created_by", Task.created_by_id)):
+        if field in fields:
+            user = aliased(User)
+            columns[field] = user.email.label(field)
+            joins.append((user, foreign_key == user.id))
+
+    if "performers" in fields:
+        performer = aliased(User)
+        columns["performers"] = (
+            select(func.aggregate_strings(performer.email, ";"))
+            .join(
+                task_user_association_table,
+                task_user_association_table.c.user_id == performer.id
+            )
+            .where(task_user_association_table.c.task_id == Task.id)
+            .scalar_subquery()
+            .label("performers"))
+
+    stmt = select(*(columns[field] for field in fields))
+    for target, onclause in joins:
+        stmt = stmt.outerjoin(target, onclause)
+
+    return stmt
+
+
+def rows_to_task_dicts(rows, fields: tuple[str, ...]):
+    """Converts flat task rows into dicts with only `fields`"""
+    tasks = [{field: row[field] for field in fields} for row in rows]
+    if "performers" in fields:
+        for task in tasks:
+            task["performers"] = (
+                task["performers"].split(";") if task["performers"] else [])
+
+    return tasks
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def get_tasks_projection(
+        session: AsyncSession,
+        fields: tuple[str, ...],
+        limit: int | None = None,
+        cursor: str | None = None,
+        filters: TaskFilter | None = None
+    ):
+    """
+    Executes query to retrieve only `fields` of tasks matching `filters`.
+    Paginates like `get_tasks_page` if `limit` is specified.
+    Returns task dicts and cursor of the next page
+    """
+    # ordering columns are needed for the cursor even if not requested
+    query_fields = tuple(dict.fromkeys((*fields, "created_at", "id")))
+    stmt = (
+        select_task_columns(query_fields)
+        .order_by(Task.created_at, Task.id))
+
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    if cursor:
+        stmt = stmt.where(
+            tuple_(Task.created_at, Task.id) > decode_cursor(cursor))
+
+    stmt = apply_task_filters(stmt, filters)
+    rows = (await session.execute(stmt)).mappings().all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+    return rows_to_task_dicts(rows, fields), next_cursor
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def search_tasks(
+        session: AsyncSession,
+        query: str,
+        fields: tuple[str, ...],
+        limit: int,
+        cursor: str | None = None,
+        filters: TaskFilter | None = None
+    ):
+    """
+    Executes full-text query to retrieve `fields` of tasks containing
+    all words of `query` in title or description, most relevant first.
+    Returns task dicts and cursor of the next page
+    """
+    words = findall(r"\w+", query)
+    if not words:
+        return list(), None
+
+    dialect_name = session.bind.dialect.name
+    condition, score = task_search_condition(dialect_name, words)
+    query_fields = tuple(dict.fromkeys((*fields, "id")))
+    stmt = (
+        select_task_columns(query_fields)
+        .add_columns(score.label("search_score"))
+        .where(condition)
+        .order_by(score, Task.id)
+        .limit(limit + 1))
+
+    if dialect_name == "sqlite":
+        stmt = stmt.join(task_fts, task_fts.c.rowid == Task.id)
+
+    if cursor:
+        stmt = stmt.where(tuple_(score, Task.id) > decode_rank_cursor(cursor))
+
+    stmt = apply_task_filters(stmt, filters)
+    rows = (await session.execute(stmt)).mappings().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(
+            rows[-1]["search_score"], rows[-1]["id"])
+
+    return rows_to_task_dicts(rows, fields), next_cursor
+
+
+async def stream_tasks_rows(
+        session: AsyncSession,
+        batch_size: int,
+        filters: TaskFilter | None = None
+    ):
+    """
+    Streams flat task rows matching `filters` from DB
+    through server-side cursor, yielding lists of up to `batch_size` rows
+    """
+    stmt = (
+        select_task_columns(TASK_PROJECTION_FIELDS)
+        .order_by(Task.created_at, Task.id)
+        .execution_options(yield_per=batch_size))
+
+    stmt = apply_task_filters(stmt, filters)
+
+    result = await session.stream(stmt)
+    async for rows in result.mappings().partitions():
+        yield rows
@@ -1,19 +1,34 @@
+from csv import DictReader
+from io import StringIO
+from json import JSONDecodeError, loads
+
 from fastapi import Form, HTTPException, status
 from loguru import logger
-from pydantic import SecretStr
-from sqlalchemy import select
+from pydantic import SecretStr, ValidationError
+from sqlalchemy import insert, or_, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from app.config import ROLE_PERMISSIONS
+from app.config import (
+    AUTH_USER_CACHE_SIZE,
+    AUTH_USER_CACHE_TTL,
+    ROLE_PERMISSIONS,
+    USER_IMPORT_BATCH_SIZE
+)
+from app.configuration.db_helper import db_helper
 from app.core.crud.role_permission import get_role_permission
 from app.core.models import User
-from app.core.schemas import UserCreate, UserSchema
+from app.core.schemas import (
+    RolePermissionSchema, UserCreate, UserImportResult, UserSchema
+)
 from app.utils import auth_jwt as auth_utils
+from app.utils.cache import TTLCache
+
+auth_user_cache = TTLCache(AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TTL)
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 def validate_creating_user(
         login: str = Form(min_length=3),
         email: str = Form(min_length=3),
@@ -28,19 +43,38 @@ def validate_creating_user(
         login=login, email=email, password=password, role=role)
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 async def create_user(session: AsyncSession, user_in: UserCreate):
     """
     Inserts new user into database (table `user`) or raises exception
     if user with the same login or email already exists
     """
     role_permission = await get_role_permission(session, user_in.role)
+    # password is hashed before the write, not to hold the DB writer
     user = User(
         login=user_in.login,
         email=user_in.email,
-        password=auth_utils.hash_password(user_in.password),
+        password=await auth_utils.hash_password_async(user_in.password),
         role_permission_id=role_permission.id
     )
+    await db_helper.run_write(session, insert_user, user)
+    invalidate_auth_user_cache(user.login)
+    created_user = UserSchema(
+        id=user.id,
+        login=user.login,
+        email=user.email,
+        password=user.password,
+        role=role_permission)
+
+    return created_user
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def insert_user(session: AsyncSession, user: User):
+    """
+    Inserts `user` into database or raises exception
+    if user with the same login or email already exists
+    """
     session.add(user)
     try:
         await session.commit()
@@ -53,17 +87,19 @@ async def create_user(session: AsyncSession, user_in: UserCreate):
     finally:
         await session.close()
 
-    created_user = UserSchema(
-        id=user.id,
-        login=user.login,
-        email=user.email,
-        password=user.password,
-        role=role_permission)
 
-    return created_user
+@logger.catch(exclude=HTTPException, reraise=True)
+async def update_user_password(
+        session: AsyncSession, user_id: int, password: bytes
+    ):
+    """Replaces password hash of the user with specified `user_id`"""
+    await session.execute(
+        update(User).where(User.id == user_id).values(password=password)
+        .execution_options(synchronize_session=False))
+    await session.commit()
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 async def get_user_by_login(session: AsyncSession, login: str):
     """Retrieves record about user from DB using specified `login`"""
     stmt = (
@@ -74,24 +110,208 @@ async def get_user_by_login(session: AsyncSession, login: str):
     return await session.scalar(stmt)
 
 
-@logger.catch(reraise=True)
-async def get_users_by_emails(session: AsyncSession, emails: list[str]):
-    """Retrieves users from database using specified `emails`"""
+@logger.catch(exclude=HTTPException, reraise=True)
+async def get_auth_user(session: AsyncSession, login: str):
+    """
+    Retrieves authenticated user by `login` from cache
+    or, if it is missing there, from DB with caching the result
+    """
+    auth_user = auth_user_cache.get(login)
+    if auth_user is None:
+        user_row = await get_user_by_login(session, login)
+        if user_row is None:
+            return None
+
+        auth_user = UserSchema(
+            id=user_row.id,
+            login=user_row.login,
+            email=user_row.email,
+            password=user_row.password,
+            role=user_row.role and RolePermissionSchema.model_validate(
+                user_row.role, from_attributes=True))
+        auth_user_cache.set(login, auth_user)
+
+    return auth_user
+
+
+def invalidate_auth_user_cache(login: str | None = None):
+    """
+    Removes user with specified `login` from authenticated users cache.
+    Clears the whole cache if `login` is not specified
+    """
+    if login is None:
+        auth_user_cache.clear()
+    else:
+        auth_user_cache.pop(login)
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def get_users_map_by_emails(session: AsyncSession, emails: set[str]):
+    """
+    Retrieves users from database using specified `emails` in one query.
+    Returns mapping of found users by their email
+    """
     stmt = (
         select(User).options(joinedload(User.role))
         .where(User.email.in_(emails))
     )
-    users = (await session.scalars(stmt)).all()
-    not_finded_emails = set(emails).difference(
-        set(user.email for user in users)
-    )
-    if not_finded_emails:
-        plural = "s" if len(not_finded_emails) > 1 else ""
-        await session.close()
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=(
-                f"User{plural} with email{plural} "
-                f"«{'», «'.join(not_finded_emails)}» not found"))
 
-    return users
+    return {user.email: user for user in await session.scalars(stmt)}
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def read_users_import_rows(content: bytes, file_format: str):
+    """
+    Parses CSV (with header `login,email,password,role`) or JSON lines
+    file content. Returns list of pairs `(line number, row)`, where row
+    is a dict of user data or an error text if the line is malformed
+    """
+    text = content.decode("utf-8-sig")
+    if file_format == "csv":
+        reader = DictReader(StringIO(text))
+        return [(reader.line_num, row) for row in reader]
+
+    rows = list()
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+
+        try:
+            row = loads(line)
+        except JSONDecodeError as error:
+            row = f"Invalid JSON: {error.msg}"
+
+        rows.append(
+            (line_number, row if isinstance(row, (dict, str))
+             else "JSON object expected"))
+
+    return rows
+
+
+async def validate_importing_user(
+        session: AsyncSession, row: dict | str, result: UserImportResult
+    ):
+    """
+    Validates single row of users import. Writes error text into
+    `result` and returns `None` if the row is invalid
+    """
+    if isinstance(row, str):
+        result.error = row
+        return None
+
+    result.login = row.get("login")
+    try:
+        user_in = UserCreate(
+            login=str(row.get("login") or ""),
+            email=str(row.get("email") or ""),
+            password=str(row.get("password") or ""),
+            role=str(row.get("role") or ""))
+        role_permission = await get_role_permission(session, user_in.role)
+
+    except ValidationError as error:
+        result.error = "; ".join(
+            f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}"
+            for detail in error.errors()
+        )
+        return None
+
+    except HTTPException as error:
+        result.error = error.detail
+        return None
+
+    return user_in, role_permission
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def insert_imported_users(
+        session: AsyncSession, batch: list[tuple[UserImportResult, dict]]
+    ):
+    """
+    Inserts batch of users with one statement. If some user of the batch
+    was registered meanwhile, inserts users one by one to find it.
+    Runs as one DB write, so it must not wait for anything but DB
+    """
+    try:
+        created_ids = (await session.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [user_values for _, user_values in batch]
+        )).all()
+        await session.commit()
+
+    except IntegrityError:
+        await session.rollback()
+        created_ids = list()
+        for result, user_values in batch:
+            try:
+                created_ids.append(await session.scalar(
+                    insert(User).values(**user_values).returning(User.id)))
+                await session.commit()
+
+            except IntegrityError:
+                await session.rollback()
+                created_ids.append(None)
+                result.error = "User with the same login or email already exists"
+
+    for (result, _), user_id in zip(batch, created_ids):
+        result.id = user_id
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+async def import_users(
+        session: AsyncSession,
+        rows: list[tuple[int, dict | str]],
+        batch_size: int = USER_IMPORT_BATCH_SIZE
+    ):
+    """
+    Validates users of import, hashes their passwords in parallel
+    and inserts them into database by batches. Returns result for
+    every row, reporting invalid and duplicate rows without aborting
+    """
+    results = list()
+    valid_users = list()
+    for line_number, row in rows:
+        result = UserImportResult(row=line_number)
+        results.append(result)
+        validated = await validate_importing_user(session, row, result)
+        if validated:
+            valid_users.append((result, *validated))
+
+    seen_logins, seen_emails = set(), set()
+    existing_rows = (await session.execute(
+        select(User.login, User.email).where(or_(
+            User.login.in_(user_in.login for _, user_in, _ in valid_users),
+            User.email.in_(user_in.email for _, user_in, _ in valid_users)))
+    )).all()
+    existing_logins = {login for login, _ in existing_rows}
+    existing_emails = {email for _, email in existing_rows}
+    unique_users = list()
+    for result, user_in, role_permission in valid_users:
+        if (user_in.login in existing_logins
+                or user_in.email in existing_emails):
+            result.error = "User with the same login or email already exists"
+        elif user_in.login in seen_logins or user_in.email in seen_emails:
+            result.error = "Duplicate login or email in the imported file"
+        else:
+            unique_users.append((result, user_in, role_permission))
+
+        seen_logins.add(user_in.login)
+        seen_emails.add(user_in.email)
+
+    for start in range(0, len(unique_users), batch_size):
+        batch = unique_users[start:start + batch_size]
+        hashed_passwords = await auth_utils.hash_passwords_async(
+            [user_in.password for _, user_in, _ in batch]
+        )
+        await db_helper.run_write(session, insert_imported_users, [
+            (
+                result,
+                dict(
+                    login=user_in.login,
+                    email=user_in.email,
+                    password=hashed_password,
+                    role_permission_id=role_permission.id))
+            for (result, user_in, role_permission), hashed_password
+            in zip(batch, hashed_passwords)
+        ])
+
+    return results
@@ -1,5 +1,7 @@
 from app.core.models.base import Base
+from app.core.models.change_marker import ChangeMarker
 from app.core.models.role_permission import RolePermission
+from app.core.models.schema_version import SchemaVersion
 from app.core.models.task import (
     Task, TaskPriority, TaskStatus, task_user_association_table
 )
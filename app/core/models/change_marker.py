@@ -0,0 +1,12 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models import Base
+
+
+class ChangeMarker(Base):
+    """Version of a group of tables incremented on each change of them"""
+    __tablename__ = "change_marker"
+
+    name = mapped_column(String(50), unique=True)
+    version: Mapped[int] = mapped_column(default=0, server_default="0")
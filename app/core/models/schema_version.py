@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models import Base
+
+
+class SchemaVersion(Base):
+    """
+    Fingerprint of DB schema and initial data applied to DB.
+    Row with `MIGRATION_LOCK` name exists only while a process migrates
+    """
+    __tablename__ = "schema_version"
+
+    name = mapped_column(String(50), unique=True)
+    version: Mapped[str] = mapped_column(String(64))
+    applied_at: Mapped[datetime] = mapped_column(default=datetime.now)
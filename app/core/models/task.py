@@ -5,6 +5,7 @@ from sqlalchemy import (
     CheckConstraint,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -31,7 +32,8 @@ task_user_association_table = Table(
         ForeignKey("user.id", ondelete="CASCADE"),
         nullable=False
     ),
-    UniqueConstraint("task_id", "user_id", name="idx_unique_task_user")
+    UniqueConstraint("task_id", "user_id", name="idx_unique_task_user"),
+    Index("idx_task_user_association_user_id", "user_id")
 )
 
 
@@ -54,7 +56,7 @@ class Task(Base):
     title = mapped_column(String(250))
     description: Mapped[str | None]
     responsible_person_id: Mapped[int | None] = mapped_column(
-        ForeignKey("user.id", ondelete="SET NULL")
+        ForeignKey("user.id", ondelete="SET NULL"), index=True
     )
     responsible_person: Mapped["User"] = relationship(
         foreign_keys=[responsible_person_id]
@@ -64,7 +66,10 @@ class Task(Base):
         back_populates="assigned_tasks"
     )
     status_id: Mapped[int] = mapped_column(
-        ForeignKey("task_status.id"), default=1, server_default="1"
+        ForeignKey("task_status.id"),
+        default=1,
+        server_default="1",
+        index=True
     )
     status: Mapped[TaskStatus] = relationship()
     priority_id: Mapped[int | None] = mapped_column(
@@ -75,6 +80,8 @@ class Task(Base):
     created_by: Mapped["User"] = relationship(
         foreign_keys=[created_by_id]
     )
-    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(
+        default=datetime.now, index=True
+    )
     deadline: Mapped[datetime | None] = mapped_column(
-        CheckConstraint("deadline > CURRENT_TIMESTAMP"))
+        CheckConstraint("deadline > CURRENT_TIMESTAMP"), index=True)
@@ -0,0 +1,91 @@
+from sqlalchemy import Connection, column, func, literal_column, table, text
+
+# External content FTS5 index of SQLite, kept in sync by triggers
+task_fts = table("task_fts", column("rowid"))
+
+SQLITE_TASK_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+        title, description, content='task', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_after_insert
+    AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_after_delete
+    AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_after_update
+    AFTER UPDATE OF title, description ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO task_fts(task_fts) VALUES ('rebuild')"
+)
+# Generated column is recalculated by PostgreSQL on every change of task
+POSTGRESQL_TASK_SEARCH_DDL = (
+    """
+    ALTER TABLE task ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector(
+            'simple',
+            coalesce(title, '') || ' ' || coalesce(description, ''))
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_task_search_vector
+    ON task USING GIN (search_vector)
+    """
+)
+
+
+def create_task_search_index(connection: Connection):
+    """
+    Creates full-text index of task title and description
+    if it does not exist yet, filling it with existing tasks
+    """
+    if connection.dialect.name == "sqlite":
+        # triggers disappear together with the task table,
+        # so they show whether the index is maintained
+        index_exists = connection.scalar(text(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE name = 'task_fts_after_insert'"))
+        if index_exists:
+            return
+
+        statements = SQLITE_TASK_SEARCH_DDL
+    else:
+        statements = POSTGRESQL_TASK_SEARCH_DDL
+
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def task_search_condition(dialect_name: str, words: list[str]):
+    """
+    Returns condition matching tasks which contain all `words`
+    and their score, where a lower score means a more relevant task
+    """
+    if dialect_name == "sqlite":
+        match_query = " ".join(f'"{word}"' for word in words)
+        return (
+            literal_column("task_fts").op("MATCH")(match_query),
+            func.bm25(literal_column("task_fts")))
+
+    search_vector = literal_column("task.search_vector")
+    ts_query = func.plainto_tsquery("simple", " ".join(words))
+    return (
+        search_vector.op("@@")(ts_query),
+        -func.ts_rank_cd(search_vector, ts_query))
@@ -2,35 +2,56 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import API_PREFIX
+from app.config import API_PREFIX, AUTH_JWT_TRUST_CLAIMS
 from app.configuration.db_helper import db_helper
 from app.core.schemas import TokenInfo, UserSchema
 from app.utils.auth_jwt import (
-    encode_jwt, get_current_token_payload, validate_auth_user
+    encode_jwt,
+    get_current_token_payload,
+    get_user_from_token_claims,
+    validate_auth_user
 )
-from app.core.crud.user import get_user_by_login
+from app.core.crud.user import get_auth_user
 
 router = APIRouter(prefix=API_PREFIX + "/auth", tags=["auth"])
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 async def get_current_auth_user(
         payload: dict = Depends(get_current_token_payload),
         session: AsyncSession = Depends(
-            db_helper.scoped_session_dependency)
+            db_helper.read_session_dependency)
     ):
     user_login = payload.get("sub")
+    user = await get_auth_user(session, user_login)
+    if user is None:
+        await session.close()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"User «{user_login}» not found")
 
-    return await get_user_by_login(session, user_login)
+    return user
 
 
 class RoleChecker:  
-    def __init__(self, allowed_roles: set[str]):  
+    def __init__(
+            self,
+            allowed_roles: set[str],
+            trust_token_claims: bool = AUTH_JWT_TRUST_CLAIMS
+        ):
         self.allowed_roles = allowed_roles
+        self.trust_token_claims = trust_token_claims
 
-    def __call__(
-            self, user: UserSchema = Depends(get_current_auth_user)
+    async def __call__(
+            self,
+            payload: dict = Depends(get_current_token_payload),
+            session: AsyncSession = Depends(
+                db_helper.read_session_dependency)
         ):
+        user = (
+            self.trust_token_claims and get_user_from_token_claims(payload)
+            or await get_current_auth_user(payload, session)
+        )
         if not user.role.position in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -48,7 +69,10 @@ async def auth_user_issue_jwt(
     jwt_payload = dict(
         sub=user.login,
         username=user.login,
-        role=user.role.position
+        role=user.role.position,
+        uid=user.id,
+        email=user.email,
+        role_id=user.role.id
     )
     token = encode_jwt(jwt_payload)
 
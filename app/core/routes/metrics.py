@@ -0,0 +1,66 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.configuration.db_helper import db_helper
+from app.core.crud.task import task_list_cache
+from app.core.crud.user import auth_user_cache
+from app.utils import metrics
+from app.utils.auth_jwt import (
+    password_hashing_executor, verified_tokens_cache
+)
+from app.utils.email_sender import mail_worker
+
+router = APIRouter(include_in_schema=False)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def collect_component_stats():
+    """Copies current statistics of app components into metrics"""
+    pool_stats = db_helper.get_pool_stats()
+    if "checkouts" in pool_stats:
+        for state in ("checked_in", "checked_out", "overflow"):
+            metrics.db_pool_connections.set(pool_stats[state], state=state)
+
+        metrics.db_pool_checkouts_total.set(pool_stats["checkouts"])
+        metrics.db_pool_checkout_timeouts_total.set(
+            pool_stats["checkout_timeouts"])
+        metrics.db_pool_checkout_wait_seconds_total.set(
+            pool_stats["checkout_wait_total_seconds"])
+
+    if db_helper.sqlite_writer is not None:
+        writer_stats = db_helper.sqlite_writer.stats()
+        metrics.db_write_queue_size.set(writer_stats["queued"])
+        metrics.db_write_jobs_total.set(writer_stats["jobs"])
+        metrics.db_write_commits_total.set(writer_stats["commits"])
+
+    mail_stats = mail_worker.stats()
+    metrics.mail_queue_size.set(mail_stats["queued"])
+    for result in ("sent", "failed", "dropped"):
+        metrics.mail_messages_total.set(mail_stats[result], result=result)
+
+    metrics.password_hashing_pending.set(password_hashing_executor.pending)
+    metrics.password_hashing_rejected_total.set(
+        password_hashing_executor.rejected)
+
+    for cache_name, cache in (
+            ("auth_user", auth_user_cache),
+            ("task_list", task_list_cache),
+            ("verified_tokens", verified_tokens_cache)):
+        cache_stats = cache.stats()
+        metrics.cache_entries.set(cache_stats["size"], cache=cache_name)
+        metrics.cache_evictions_total.set(
+            cache_stats["evictions"], cache=cache_name)
+        for result in ("hits", "misses"):
+            metrics.cache_requests_total.set(
+                cache_stats[result], cache=cache_name, result=result)
+
+    metrics.task_list_cache_bytes.set(task_list_cache.bytes)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    collect_component_stats()
+
+    return PlainTextResponse(
+        metrics.registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
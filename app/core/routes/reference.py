@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import API_PREFIX, REFERENCE_DATA_CACHE_MAX_AGE
+from app.configuration.db_helper import db_helper
+from app.core.crud.change_marker import (
+    REFERENCE_CHANGE_MARKER, bump_change_marker
+)
+from app.core.crud.reference_data import reference_data
+from app.core.crud.task import mark_tasks_changed
+from app.core.crud.user import invalidate_auth_user_cache
+from app.core.routes.auth import RoleChecker
+from app.core.schemas import (
+    RolePermissionSchema, TaskPrioritySchema, TaskStatusSchema, UserSchema
+)
+
+router = APIRouter(prefix=API_PREFIX + "/reference", tags=["reference"])
+
+
+def set_cache_headers(response: Response):
+    response.headers["Cache-Control"] = (
+        f"public, max-age={REFERENCE_DATA_CACHE_MAX_AGE}")
+
+
+@router.get("/task_statuses", response_model=list[TaskStatusSchema])
+async def get_task_statuses(response: Response):
+    set_cache_headers(response)
+
+    return list(reference_data.statuses.values())
+
+
+@router.get("/task_priorities", response_model=list[TaskPrioritySchema])
+async def get_task_priorities(response: Response):
+    set_cache_headers(response)
+
+    return list(reference_data.priorities.values())
+
+
+@router.get("/roles", response_model=list[RolePermissionSchema])
+async def get_roles(response: Response):
+    set_cache_headers(response)
+
+    return list(reference_data.roles.values())
+
+
+async def mark_reference_data_changed(session: AsyncSession):
+    # other worker processes reload reference data seeing this marker
+    await bump_change_marker(session, REFERENCE_CHANGE_MARKER)
+    # names of statuses, priorities and roles are part of task listings
+    await mark_tasks_changed(session)
+    await session.commit()
+
+
+@router.post("/refresh", status_code=204)
+async def refresh_reference_data(
+        user: UserSchema = Depends(RoleChecker({"Owner", "Admin"})),
+        session: AsyncSession = Depends(
+            db_helper.scoped_session_dependency)):
+
+    await reference_data.refresh(session)
+    await db_helper.run_write(session, mark_reference_data_changed)
+    invalidate_auth_user_cache()
@@ -1,25 +1,97 @@
+from typing import Literal
+
 from fastapi import (
-    APIRouter, BackgroundTasks, Depends, Form, HTTPException, status
+    APIRouter,
+    Depends,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status
 )
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import API_PREFIX
+from app.config import (
+    API_PREFIX, TASK_PAGE_DEFAULT_LIMIT, TASK_PAGE_MAX_LIMIT
+)
 from app.configuration.db_helper import db_helper
+from app.core.crud.change_marker import TASK_CHANGE_MARKER, get_change_marker
 from app.core.crud.task import (
     delete_task,
     generate_task,
+    generate_tasks_bulk,
     get_all_tasks,
+    get_tasks_page,
+    get_tasks_projection,
+    search_tasks,
+    task_list_cache,
     update_task,
-    update_task_status
+    update_task_status,
+    update_tasks_status_bulk,
+    validate_search_fields,
+    validate_task_fields,
+    validate_task_filters
 )
 from app.core.routes.auth import RoleChecker
 from app.core.schemas import (
-    TaskCreate, TaskSchema, TaskUpdate, UserSchema
+    TaskBulkCreate,
+    TaskBulkCreateResult,
+    TaskBulkStatusChange,
+    TaskBulkStatusChangeResult,
+    TaskCreate,
+    TaskFilter,
+    TaskPage,
+    TaskSchema,
+    TaskSummaryPage,
+    TaskSummarySchema,
+    TaskUpdate,
+    UserSchema
 )
 from app.core.schemas.validators import check_task_status
-from app.utils.email_sender import notify_about_change_task_status
+from app.utils.email_sender import (
+    notify_about_bulk_change_task_status, notify_about_change_task_status
+)
+from app.utils.etag import etag_matches, make_etag
+from app.utils.export import EXPORT_MEDIA_TYPES, generate_tasks_export
+from app.utils.read_your_writes import wrote_recently
 
 router = APIRouter(prefix=API_PREFIX + "/task", tags=["task"])
+# response of /retrieve by pagination mode and presence of `fields`
+tasks_adapters = {
+    (False, False): TypeAdapter(TaskPage),
+    (False, True): TypeAdapter(TaskSummaryPage),
+    (True, False): TypeAdapter(list[TaskSchema]),
+    (True, True): TypeAdapter(list[TaskSummarySchema])
+}
+
+
+async def check_tasks_etag(
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(
+            db_helper.read_session_dependency)):
+    """
+    Derives ETag of task listing from the tasks change marker and
+    query parameters. Answers `304 Not Modified` without querying
+    tasks if the client already has the current version
+    """
+    etag = make_etag(
+        await get_change_marker(session, TASK_CHANGE_MARKER),
+        request.url.path,
+        sorted(request.query_params.multi_items()))
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        await session.close()
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+
+    return etag
 
 
 @router.post("/create", response_model=TaskSchema, status_code=201)
@@ -31,7 +103,23 @@ async def create_task(
         session: AsyncSession = Depends(
             db_helper.scoped_session_dependency)):
 
-    return await generate_task(session, task_in, user)
+    return await db_helper.run_write(session, generate_task, task_in, user)
+
+
+@router.post(
+    "/bulk_create",
+    response_model=list[TaskBulkCreateResult],
+    status_code=201)
+async def create_tasks_bulk(
+        tasks_in: TaskBulkCreate,
+        user: UserSchema = Depends(
+            RoleChecker({"Owner", "Admin", "Project Manager"})
+        ),
+        session: AsyncSession = Depends(
+            db_helper.scoped_session_dependency)):
+
+    return await db_helper.run_write(
+        session, generate_tasks_bulk, tasks_in.tasks, user)
 
 
 @router.put("/edit", response_model=TaskSchema)
@@ -43,12 +131,11 @@ async def edit_task(
         session: AsyncSession = Depends(
             db_helper.scoped_session_dependency)):
 
-    return await update_task(session, task_in)
+    return await db_helper.run_write(session, update_task, task_in)
 
 
 @router.patch("/change_task_status", response_model=TaskSchema)
 async def change_task_status(
-        background_tasks: BackgroundTasks,
         task_id: int = Form(ge=1),
         status_name: str = Depends(check_task_status),
         user: UserSchema = Depends(
@@ -57,8 +144,8 @@ async def change_task_status(
         session: AsyncSession = Depends(
             db_helper.scoped_session_dependency)):
 
-    updated_task = await update_task_status(
-        session, task_id, status_name
+    updated_task = await db_helper.run_write(
+        session, update_task_status, task_id, status_name
     )
     if updated_task is None:
         await session.close()
@@ -66,10 +153,32 @@ async def change_task_status(
             status_code=status.HTTP_200_OK,
             detail=f"Task is already in «{status_name}» status")
 
-    notify_about_change_task_status(updated_task, user, background_tasks)
+    notify_about_change_task_status(updated_task, user)
 
     return updated_task
 
+
+@router.patch(
+    "/bulk_change_status", response_model=list[TaskBulkStatusChangeResult])
+async def change_tasks_status_bulk(
+        change_in: TaskBulkStatusChange,
+        user: UserSchema = Depends(
+            RoleChecker({"Admin", "Project Manager", "Developer"})
+        ),
+        session: AsyncSession = Depends(
+            db_helper.scoped_session_dependency)):
+
+    results, updated_tasks = await db_helper.run_write(
+        session,
+        update_tasks_status_bulk,
+        change_in.task_ids,
+        change_in.status
+    )
+    notify_about_bulk_change_task_status(
+        updated_tasks, change_in.status, user)
+
+    return results
+
 @router.delete("/remove", response_model=TaskSchema)
 async def remove_task(
         task_id: int = Form(ge=1),
@@ -79,11 +188,108 @@ async def remove_task(
         session: AsyncSession = Depends(
             db_helper.scoped_session_dependency)):
 
-    return await delete_task(session, task_id)
+    return await db_helper.run_write(session, delete_task, task_id)
 
 
-@router.get("/retrieve", response_model=list[TaskSchema])
-async def get_tasks(session: AsyncSession = Depends(
-            db_helper.scoped_session_dependency)):
+@router.get(
+    "/retrieve",
+    response_model=(
+        TaskPage | TaskSummaryPage |
+        list[TaskSchema] | list[TaskSummarySchema]),
+    response_model_exclude_unset=True,
+    description=(
+        "Returns a page of tasks with `next_cursor`. With `unpaginated` "
+        "returns the plain list of all tasks, as before pagination"))
+async def get_tasks(
+        response: Response,
+        limit: int = Query(
+            TASK_PAGE_DEFAULT_LIMIT, ge=1, le=TASK_PAGE_MAX_LIMIT),
+        cursor: str | None = Query(
+            None, description="`next_cursor` value of the previous page"),
+        unpaginated: bool = Query(
+            False,
+            description="Return plain list of all tasks at once (slow)"),
+        filters: TaskFilter = Depends(validate_task_filters),
+        fields: tuple[str, ...] | None = Depends(validate_task_fields),
+        etag: str = Depends(check_tasks_etag),
+        session: AsyncSession = Depends(
+            db_helper.read_session_dependency)):
+
+    # ETag covers the change marker and all query parameters,
+    # so it identifies the serialized listing precisely
+    content = task_list_cache.get(etag)
+    if content is None:
+        if fields:
+            tasks, next_cursor = await get_tasks_projection(
+                session,
+                fields,
+                None if unpaginated else limit,
+                cursor,
+                filters
+            )
+        elif unpaginated:
+            tasks, next_cursor = await get_all_tasks(session, filters), None
+        else:
+            tasks, next_cursor = await get_tasks_page(
+                session, limit, cursor, filters
+            )
+
+        adapter = tasks_adapters[unpaginated, bool(fields)]
+        content = adapter.dump_json(
+            adapter.validate_python(
+                tasks if unpaginated
+                else dict(items=tasks, next_cursor=next_cursor),
+                from_attributes=True),
+            exclude_unset=True)
+        task_list_cache.set(etag, content)
+
+    return Response(
+        content,
+        media_type="application/json",
+        headers=dict(response.headers))
+
+
+@router.get(
+    "/search",
+    response_model=TaskSummaryPage,
+    response_model_exclude_unset=True)
+async def search_tasks_by_text(
+        q: str = Query(
+            min_length=1,
+            max_length=200,
+            description="Words which title or description must contain"),
+        limit: int = Query(
+            TASK_PAGE_DEFAULT_LIMIT, ge=1, le=TASK_PAGE_MAX_LIMIT),
+        cursor: str | None = Query(
+            None, description="`next_cursor` value of the previous page"),
+        filters: TaskFilter = Depends(validate_task_filters),
+        fields: tuple[str, ...] = Depends(validate_search_fields),
+        session: AsyncSession = Depends(
+            db_helper.read_session_dependency)):
+
+    tasks, next_cursor = await search_tasks(
+        session, q, fields, limit, cursor, filters
+    )
+
+    return dict(items=tasks, next_cursor=next_cursor)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(check_tasks_etag)])
+async def export_tasks(
+        request: Request,
+        response: Response,
+        export_format: Literal["ndjson", "csv"] = Query(
+            "ndjson", alias="format"),
+        filters: TaskFilter = Depends(validate_task_filters)):
 
-    return await get_all_tasks(session)
+    return StreamingResponse(
+        generate_tasks_export(
+            export_format, filters, use_primary=wrote_recently(request)),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            **response.headers,
+            "Content-Disposition":
+                f"attachment; filename=tasks.{export_format}"})
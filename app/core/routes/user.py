@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, Form, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import API_PREFIX
 from app.configuration.db_helper import db_helper
-from app.core.crud.user import create_user, validate_creating_user
-from app.core.routes.auth import get_current_auth_user
-from app.core.schemas import UserCreate, UserSchema
+from app.core.crud.user import (
+    create_user, import_users, read_users_import_rows, validate_creating_user
+)
+from app.core.routes.auth import RoleChecker, get_current_auth_user
+from app.core.schemas import UserCreate, UserImportResult, UserSchema
 
 router = APIRouter(prefix=API_PREFIX + "/user", tags=["user"])
 
@@ -19,6 +23,23 @@ async def register_user(
     return await create_user(session, user_in)
 
 
+@router.post(
+    "/import", response_model=list[UserImportResult], status_code=201)
+async def import_users_from_file(
+        file: UploadFile = File(
+            description=(
+                "CSV with header `login,email,password,role` "
+                "or JSON lines with the same keys")),
+        file_format: Literal["csv", "jsonl"] = Form("csv"),
+        user: UserSchema = Depends(RoleChecker({"Owner", "Admin"})),
+        session: AsyncSession = Depends(
+            db_helper.scoped_session_dependency)):
+
+    rows = read_users_import_rows(await file.read(), file_format)
+
+    return await import_users(session, rows)
+
+
 @router.get("/details", response_model=UserSchema)
 async def get_user_data(
         user: UserSchema = Depends(get_current_auth_user)):
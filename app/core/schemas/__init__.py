@@ -1,10 +1,22 @@
 from app.core.schemas.role_permission import (
     RolePermissionCreate, RolePermissionSchema
 )
-from app.core.schemas.user import TokenInfo, UserCreate, UserSchema
+from app.core.schemas.user import (
+    TokenInfo, UserCreate, UserImportResult, UserSchema
+)
 from app.core.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkCreateResult,
+    TaskBulkStatusChange,
+    TaskBulkStatusChangeResult,
     TaskCreate,
+    TaskFilter,
+    TaskPage,
     TaskSchema,
+    TaskSummaryPage,
+    TaskSummarySchema,
     TaskUpdate,
     TaskPriorityCreate,
-    TaskStatusCreate)
+    TaskPrioritySchema,
+    TaskStatusCreate,
+    TaskStatusSchema)
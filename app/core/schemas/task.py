@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import (
     BeforeValidator,
@@ -9,7 +9,9 @@ from pydantic import (
     FutureDatetime,
     NonNegativeInt)
 
-from app.config import TASK_PRIORITY_LABELS, TASK_STATUSES
+from app.config import (
+    TASK_BULK_MAX_SIZE, TASK_PRIORITY_LABELS, TASK_STATUSES
+)
 from app.core.schemas import UserSchema
 from app.core.schemas.validators import (
     check_task_priority, check_task_status
@@ -72,3 +74,81 @@ class TaskSchema(TaskCreate):
     created_at: datetime
     created_by: UserSchema
     deadline: datetime | None
+
+
+class TaskPage(BaseModel):
+    items: list[TaskSchema]
+    next_cursor: str | None = None
+
+
+class TaskSummarySchema(BaseModel):
+    """
+    Flat projection of task. Related objects are represented
+    by their names and emails, unrequested fields are omitted
+    """
+    id: int | None = None
+    title: str | None = None
+    description: str | None = None
+    status: str | None = None
+    priority: str | None = None
+    responsible_person: EmailStr | None = None
+    performers: list[EmailStr] | None = None
+    created_by: EmailStr | None = None
+    created_at: datetime | None = None
+    deadline: datetime | None = None
+
+
+class TaskSummaryPage(BaseModel):
+    items: list[TaskSummarySchema]
+    next_cursor: str | None = None
+
+
+class TaskFilter(BaseModel):
+    status: Annotated[
+        str | None,
+        BeforeValidator(lambda status: status and check_task_status(status))
+    ] = None
+    priority: Annotated[
+        NonNegativeInt | None,
+        BeforeValidator(
+            lambda priority: priority and check_task_priority(priority))
+    ] = None
+    responsible_person: EmailStr | None = None
+    performer: EmailStr | None = None
+    created_by: EmailStr | None = None
+    deadline_from: Annotated[
+        datetime | None,
+        BeforeValidator(lambda date: date and parse_like_datetime(date))
+    ] = None
+    deadline_to: Annotated[
+        datetime | None,
+        BeforeValidator(lambda date: date and parse_like_datetime(date))
+    ] = None
+
+
+class TaskBulkCreate(BaseModel):
+    tasks: Annotated[
+        list[TaskCreate], Field(min_length=1, max_length=TASK_BULK_MAX_SIZE)
+    ]
+
+
+class TaskBulkCreateResult(BaseModel):
+    index: int
+    id: int | None = None
+    error: str | None = None
+
+
+class TaskBulkStatusChange(BaseModel):
+    task_ids: Annotated[
+        list[int], Field(min_length=1, max_length=TASK_BULK_MAX_SIZE)
+    ]
+    status: Annotated[
+        str,
+        Field(examples=TASK_STATUSES),
+        BeforeValidator(check_task_status)
+    ]
+
+
+class TaskBulkStatusChangeResult(BaseModel):
+    task_id: int
+    result: Literal["changed", "unchanged", "not_found"]
@@ -30,3 +30,10 @@ class UserSchema(UserBase):
 class TokenInfo(BaseModel):
     access_token: str
     token_type: str = "Bearer"
+
+
+class UserImportResult(BaseModel):
+    row: int
+    login: str | None = None
+    id: int | None = None
+    error: str | None = None
@@ -8,7 +8,7 @@ task_priority_levels = {
 }
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 def check_task_priority(priority_name: str):
     """
     Validates accordance
@@ -26,7 +26,7 @@ def check_task_priority(priority_name: str):
     return task_priority_level
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 def check_task_status(status_name: str = Form(
         examples=["In progress"],
         description=f"Choose one of this: «{'», «'.join(TASK_STATUSES)}»"
@@ -1,7 +1,13 @@
+from asyncio import Semaphore, gather
 from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from time import perf_counter, time
 
 import bcrypt
 import jwt
+from cryptography.hazmat.primitives.asymmetric.types import (
+    PrivateKeyTypes, PublicKeyTypes
+)
 from fastapi import Depends, Form, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from loguru import logger
@@ -13,19 +19,49 @@ from app.config import (
     AUTH_JWT_ACCESS_TOKEN_EXPIRE_MINUTES,
     AUTH_JWT_ALGORITHM,
     AUTH_JWT_PRIVATE_KEY,
-    AUTH_JWT_PUBLIC_KEY
+    AUTH_JWT_PUBLIC_KEY,
+    AUTH_JWT_VERIFIED_CACHE_SIZE,
+    PASSWORD_HASHING_BCRYPT_ROUNDS,
+    PASSWORD_HASHING_QUEUE_SIZE,
+    PASSWORD_HASHING_WORKERS
 )
 from app.configuration.db_helper import db_helper
-from app.core.crud.user import get_user_by_login
+from app.core.crud.user import get_user_by_login, update_user_password
+from app.core.schemas import RolePermissionSchema, UserSchema
+from app.utils.cache import TTLCache
+from app.utils.executor import BoundedExecutor
+from app.utils.metrics import (
+    auth_logins_total, password_hashing_duration_seconds
+)
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=API_PREFIX + "/auth/jwt/login")
+verified_tokens_cache = TTLCache(
+    maxsize=AUTH_JWT_VERIFIED_CACHE_SIZE,
+    ttl=AUTH_JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+password_hashing_executor = BoundedExecutor(
+    max_workers=PASSWORD_HASHING_WORKERS,
+    max_queue_size=PASSWORD_HASHING_QUEUE_SIZE,
+    name="password-hashing")
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def load_jwt_key(key: str, algorithm: str = AUTH_JWT_ALGORITHM):
+    """
+    Parses PEM text into key object of `algorithm`
+    so it is not parsed again on every encoding or decoding
+    """
+    return jwt.get_algorithm_by_name(algorithm).prepare_key(key)
+
+
+jwt_private_key = load_jwt_key(AUTH_JWT_PRIVATE_KEY)
+jwt_public_key = load_jwt_key(AUTH_JWT_PUBLIC_KEY)
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 def encode_jwt(
         payload: dict,
-        private_key: str = AUTH_JWT_PRIVATE_KEY,
+        private_key: str | PrivateKeyTypes = jwt_private_key,
         algorithm: str = AUTH_JWT_ALGORITHM,
         expire_minutes: int = AUTH_JWT_ACCESS_TOKEN_EXPIRE_MINUTES,
         expire_timedelta: timedelta | None = None
@@ -42,26 +78,73 @@ def encode_jwt(
     return jwt.encode(payload_to_encode, private_key, algorithm)
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 def decode_jwt(
         token: str,
-        public_key: str = AUTH_JWT_PUBLIC_KEY,
+        public_key: str | PublicKeyTypes = jwt_public_key,
         algorithm: str = AUTH_JWT_ALGORITHM
     ):
     """Decodes data from JWT token"""
     return jwt.decode(token, public_key, algorithms=[algorithm])
 
 
-@logger.catch(reraise=True)
-def hash_password(password: SecretStr | str):
+@logger.catch(exclude=HTTPException, reraise=True)
+def decode_jwt_cached(token: str):
+    """
+    Decodes data from JWT token, verifying its signature only
+    the first time the token is met until the token expires
+    """
+    token_digest = sha256(token.encode()).digest()
+    payload = verified_tokens_cache.get(token_digest)
+    if payload is None:
+        payload = decode_jwt(token=token)
+        expires_in = payload.get("exp", 0) - time()
+        if expires_in > 0:
+            verified_tokens_cache.set(
+                token_digest,
+                payload,
+                ttl=min(expires_in, verified_tokens_cache.ttl))
+
+    return payload.copy()
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def hash_password(
+        password: SecretStr | str,
+        rounds: int = PASSWORD_HASHING_BCRYPT_ROUNDS
+    ):
     """Hashes password string into bytes"""
     if isinstance(password, SecretStr):
         password = password.get_secret_value()
 
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds))
 
 
-@logger.catch(reraise=True)
+async def hash_password_async(password: SecretStr | str):
+    """Hashes password in the executor without blocking event loop"""
+    started_at = perf_counter()
+    try:
+        return await password_hashing_executor.run(hash_password, password)
+    finally:
+        password_hashing_duration_seconds.observe(
+            perf_counter() - started_at, operation="hash")
+
+
+async def hash_passwords_async(passwords: list[SecretStr | str]):
+    """
+    Hashes many passwords in parallel on all executor workers,
+    submitting no more jobs at once than there are workers
+    """
+    semaphore = Semaphore(password_hashing_executor.max_workers)
+
+    async def hash_with_limit(password: SecretStr | str):
+        async with semaphore:
+            return await hash_password_async(password)
+
+    return await gather(*map(hash_with_limit, passwords))
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
 def validate_password(password: SecretStr | str, hashed_password: bytes):
     """Compares password string with the hashed password"""
     if isinstance(password, SecretStr):
@@ -70,14 +153,35 @@ def validate_password(password: SecretStr | str, hashed_password: bytes):
     return bcrypt.checkpw(password.encode(), hashed_password)
 
 
-@logger.catch(reraise=True)
+async def validate_password_async(
+        password: SecretStr | str, hashed_password: bytes
+    ):
+    """Compares password in the executor without blocking event loop"""
+    started_at = perf_counter()
+    try:
+        return await password_hashing_executor.run(
+            validate_password, password, hashed_password)
+    finally:
+        password_hashing_duration_seconds.observe(
+            perf_counter() - started_at, operation="check")
+
+
+def password_needs_rehash(
+        hashed_password: bytes,
+        rounds: int = PASSWORD_HASHING_BCRYPT_ROUNDS
+    ):
+    """Checks whether the hash was made with another cost factor"""
+    return int(hashed_password.split(b"$")[2]) != rounds
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
 def get_current_token_payload(token: str = Depends(oauth2_scheme)):
     """
     Retrieves data encrypted in JWT token
     or raises an exception about invalidity of the token
     """
     try:
-        payload = decode_jwt(token=token)
+        payload = decode_jwt_cached(token=token)
     except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -86,7 +190,27 @@ def get_current_token_payload(token: str = Depends(oauth2_scheme)):
     return payload
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
+def get_user_from_token_claims(payload: dict):
+    """
+    Builds authenticated user from signed JWT claims without DB lookup.
+    Returns `None` if token was issued without necessary claims
+    """
+    if not all(
+            payload.get(claim) is not None
+            for claim in ("sub", "uid", "email", "role", "role_id")):
+        return None
+
+    return UserSchema(
+        id=payload["uid"],
+        login=payload["sub"],
+        email=payload["email"],
+        password=b"",
+        role=RolePermissionSchema(
+            id=payload["role_id"], position=payload["role"]))
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
 async def validate_auth_user(
         username: str = Form(),
         password: SecretStr = Form(),
@@ -98,9 +222,18 @@ async def validate_auth_user(
     Returns a record about the user from DB if the check is successful
     """
     logged_user = await get_user_by_login(session, username)
-    if logged_user and validate_password(password, logged_user.password):
+    if logged_user and await validate_password_async(
+            password, logged_user.password):
+        if password_needs_rehash(logged_user.password):
+            password_hash = await hash_password_async(password)
+            await db_helper.run_write(
+                session, update_user_password, logged_user.id, password_hash)
+            logged_user.password = password_hash
+
+        auth_logins_total.inc(result="success")
         return logged_user
 
+    auth_logins_total.inc(result="failure")
     await session.close()
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
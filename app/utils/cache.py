@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from time import monotonic
+
+
+class TTLCache:
+    """
+    Bounded in-memory mapping which evicts least recently used entries
+    when `maxsize` is reached and forgets entries older than `ttl` seconds
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key, default=None):
+        entry = self.__entries.get(key)
+        if entry is None or entry[0] <= monotonic():
+            if entry is not None:
+                del self.__entries[key]
+
+            self.misses += 1
+            return default
+
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, ttl: float | None = None):
+        if self.maxsize <= 0:
+            return
+
+        expires_at = monotonic() + (self.ttl if ttl is None else ttl)
+        self.__entries[key] = (expires_at, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.maxsize:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        entry = self.__entries.pop(key, None)
+
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self.__entries.clear()
+
+    def stats(self):
+        return dict(
+            size=len(self.__entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions)
+
+
+class SizedLRUCache:
+    """
+    Bounded in-memory mapping of byte strings which evicts least
+    recently used entries when their total size exceeds `max_bytes`
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries: OrderedDict[object, bytes] = OrderedDict()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key, default=None):
+        value = self.__entries.get(key)
+        if value is None:
+            self.misses += 1
+            return default
+
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+
+        self.pop(key)
+        self.__entries[key] = value
+        self.bytes += len(value)
+        while self.bytes > self.max_bytes:
+            _, evicted_value = self.__entries.popitem(last=False)
+            self.bytes -= len(evicted_value)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        value = self.__entries.pop(key, None)
+        if value is None:
+            return default
+
+        self.bytes -= len(value)
+        return value
+
+    def clear(self):
+        self.__entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return dict(
+            size=len(self.__entries),
+            bytes=self.bytes,
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions)
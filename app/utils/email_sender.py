@@ -1,57 +1,363 @@
+from asyncio import (
+    CancelledError,
+    Queue,
+    QueueFull,
+    TimeoutError as WaitTimeoutError,
+    create_task,
+    gather,
+    get_running_loop,
+    sleep,
+    to_thread,
+    wait_for
+)
+from email.message import Message
 from email.mime.text import MIMEText
-from smtplib import SMTP
+from smtplib import (
+    SMTP,
+    SMTPDataError,
+    SMTPException,
+    SMTPRecipientsRefused,
+    SMTPSenderRefused
+)
 from ssl import create_default_context
 
-from fastapi import BackgroundTasks
 from loguru import logger
 
-from app.config import MAIL_HOST, MAIL_PASSWORD, MAIL_PORT, MAIL_USERNAME
+from app.config import (
+    MAIL_CONCURRENCY,
+    MAIL_DIGEST_WINDOW,
+    MAIL_HOST,
+    MAIL_MAX_RETRIES,
+    MAIL_PASSWORD,
+    MAIL_PORT,
+    MAIL_QUEUE_SIZE,
+    MAIL_SHUTDOWN_TIMEOUT,
+    MAIL_STARTTLS,
+    MAIL_USERNAME
+)
 from app.core.schemas import TaskSchema, UserSchema
 
 
+class MailWorker:
+    """
+    In-process mail delivery queue. Each of `concurrency` workers
+    keeps its own authenticated SMTP connection open between messages
+    and reconnects with exponential backoff when it is lost
+    """
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            username: str = "",
+            password: str = "",
+            starttls: bool = True,
+            concurrency: int = 2,
+            queue_size: int = 1000,
+            max_retries: int = 3,
+            backoff: float = 1.0,
+            timeout: float = 30.0
+        ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.queue = Queue(maxsize=queue_size)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.__workers = list()
+
+    def enqueue(self, message: Message):
+        """Puts `message` into the delivery queue without waiting"""
+        try:
+            self.queue.put_nowait(message)
+        except QueueFull:
+            self.dropped += 1
+            logger.error(
+                f"Mail queue is full. Mail to {message['To']} dropped")
+            return False
+
+        return True
+
+    async def start(self):
+        self.__workers = [
+            create_task(self.__work()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self, timeout: float = MAIL_SHUTDOWN_TIMEOUT):
+        """Waits until queued mails are sent, then stops workers"""
+        try:
+            await wait_for(self.queue.join(), timeout)
+        except WaitTimeoutError:
+            logger.error(
+                f"{self.queue.qsize()} queued mails were not sent "
+                f"within {timeout} seconds of shutdown")
+
+        for worker in self.__workers:
+            worker.cancel()
+
+        await gather(*self.__workers, return_exceptions=True)
+        self.__workers.clear()
+
+    def __connect(self):
+        connection = SMTP(self.host, self.port, timeout=self.timeout)
+        connection.ehlo()
+        if self.starttls:
+            connection.starttls(context=create_default_context())
+            connection.ehlo()
+
+        if self.username:
+            connection.login(self.username, self.password)
+
+        return connection
+
+    @staticmethod
+    def __disconnect(connection: SMTP):
+        try:
+            connection.quit()
+        except (SMTPException, OSError):
+            connection.close()
+
+    async def __work(self):
+        connection = None
+        try:
+            while True:
+                message = await self.queue.get()
+                try:
+                    connection = await self.__deliver(connection, message)
+                except CancelledError:
+                    raise
+                except Exception:
+                    # a worker must survive any error, otherwise
+                    # delivery silently loses concurrency until it stops
+                    self.failed += 1
+                    logger.exception(
+                        f"Mail to {message['To']} failed unexpectedly")
+                    if connection is not None:
+                        await to_thread(self.__disconnect, connection)
+                        connection = None
+                finally:
+                    self.queue.task_done()
+
+        except CancelledError:
+            pass
+
+        finally:
+            if connection is not None:
+                await to_thread(self.__disconnect, connection)
+
+    async def __deliver(self, connection: SMTP | None, message: Message):
+        """
+        Sends `message` through `connection`, reconnecting if needed.
+        Returns the connection to be reused for the next message
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                if connection is None:
+                    connection = await to_thread(self.__connect)
+
+                await to_thread(connection.send_message, message)
+                self.sent += 1
+                logger.info(f"Mail sended to {message['To']} successfully!")
+
+                return connection
+
+            except (SMTPRecipientsRefused, SMTPSenderRefused, SMTPDataError):
+                self.failed += 1
+                logger.exception(f"Mail to {message['To']} was rejected")
+
+                return connection
+
+            except (SMTPException, OSError) as error:
+                if connection is not None:
+                    await to_thread(self.__disconnect, connection)
+                    connection = None
+
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logger.error(
+                        f"Mail to {message['To']} was not sent after "
+                        f"{attempt + 1} attempts: {error!r}")
+                    return None
+
+                await sleep(self.backoff * 2 ** attempt)
+
+    def stats(self):
+        return dict(
+            queued=self.queue.qsize(),
+            sent=self.sent,
+            failed=self.failed,
+            dropped=self.dropped)
+
+
+mail_worker = MailWorker(
+    host=MAIL_HOST,
+    port=MAIL_PORT,
+    username=MAIL_USERNAME,
+    password=MAIL_PASSWORD,
+    starttls=MAIL_STARTTLS,
+    concurrency=MAIL_CONCURRENCY,
+    queue_size=MAIL_QUEUE_SIZE,
+    max_retries=MAIL_MAX_RETRIES)
+
+
+class TaskStatusDigest:
+    """
+    Collects task status changes per responsible person during
+    `window` seconds and then sends them as a single mail
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.__pending: dict[str, dict] = dict()
+
+    def add(
+            self,
+            recipient: UserSchema,
+            task_id: int,
+            task_title: str,
+            status_name: str,
+            mail_from: str
+        ):
+        digest = self.__pending.get(recipient.email)
+        if digest is None:
+            digest = self.__pending[recipient.email] = dict(
+                login=recipient.login,
+                tasks=dict(),
+                timer=get_running_loop().call_later(
+                    self.window, self.flush, recipient.email))
+
+        digest["mail_from"] = mail_from
+        digest["tasks"][task_id] = (task_title, status_name)
+
+    def flush(self, recipient_email: str):
+        """Sends collected changes to `recipient_email` in one mail"""
+        digest = self.__pending.pop(recipient_email, None)
+        if digest is None:
+            return
+
+        digest["timer"].cancel()
+        send_status_changes_mail(
+            recipient_login=digest["login"],
+            recipient_email=recipient_email,
+            changes=list(digest["tasks"].values()),
+            mail_from=digest["mail_from"])
+
+    def flush_all(self):
+        for recipient_email in tuple(self.__pending):
+            self.flush(recipient_email)
+
+
+task_status_digest = TaskStatusDigest(window=MAIL_DIGEST_WINDOW)
+
+
 @logger.catch(reraise=True)
 def notify_about_change_task_status(
-        updated_task: TaskSchema,
-        user_changer: UserSchema,
-        background_tasks: BackgroundTasks
+        updated_task: TaskSchema, user_changer: UserSchema
     ):
     """
     Generates mail text about change task status and
-    creates background task to send it
+    puts it into the mail delivery queue
+    or into the digest of the responsible person, if digest is enabled
     """
+    if task_status_digest.window > 0:
+        return task_status_digest.add(
+            updated_task.responsible_person,
+            updated_task.id,
+            updated_task.title,
+            updated_task.status.name,
+            user_changer.email)
+
     mail_text = (
         f"<h1>Hello, {updated_task.responsible_person.login}</h1>"
         f"<h3>For task «<i>{updated_task.title}</i>» "
         f"status was changed to «<i>{updated_task.status.name}</i>»</h3>"
     )
-    background_tasks.add_task(
-        send_mail,
+    send_mail(
         mail_text=mail_text,
         mail_from=user_changer.email,
         mail_to=updated_task.responsible_person.email,
         mail_subj=f"Task «{updated_task.title}» status has been changed")
 
 
+@logger.catch(reraise=True)
+def notify_about_bulk_change_task_status(
+        updated_tasks: list[TaskSchema],
+        status_name: str,
+        user_changer: UserSchema
+    ):
+    """
+    Groups changed tasks by responsible person and
+    puts one mail per person into the mail delivery queue
+    or into the digest of the person, if digest is enabled
+    """
+    changes_by_recipient = dict()
+    for task in updated_tasks:
+        if task.responsible_person is None:
+            continue
+
+        if task_status_digest.window > 0:
+            task_status_digest.add(
+                task.responsible_person,
+                task.id,
+                task.title,
+                status_name,
+                user_changer.email)
+        else:
+            changes_by_recipient.setdefault(
+                task.responsible_person.email,
+                (task.responsible_person.login, list())
+            )[1].append((task.title, status_name))
+
+    for recipient_email, (login, changes) in changes_by_recipient.items():
+        send_status_changes_mail(
+            login, recipient_email, changes, user_changer.email)
+
+
+@logger.catch(reraise=True)
+def send_status_changes_mail(
+        recipient_login: str,
+        recipient_email: str,
+        changes: list[tuple[str, str]],
+        mail_from: str
+    ):
+    """Generates one mail about status changes of several tasks"""
+    tasks_list = "".join(
+        f"<li>«<i>{title}</i>» → «<i>{status_name}</i>»</li>"
+        for title, status_name in changes
+    )
+    send_mail(
+        mail_text=(
+            f"<h1>Hello, {recipient_login}</h1>"
+            "<h3>Status was changed for tasks:</h3>"
+            f"<ul>{tasks_list}</ul>"),
+        mail_from=mail_from,
+        mail_to=recipient_email,
+        mail_subj=f"Status has been changed for {len(changes)} task(s)")
+
+
 @logger.catch()
 def send_mail(
-        mail_text: str, mail_from: str, mail_to: str, mail_subj: str
+        mail_text: str,
+        mail_from: str,
+        mail_to: str,
+        mail_subj: str,
+        worker: MailWorker = mail_worker
     ):
     """
-    Connects to SMTP server and
-    sends message through it to specified email
+    Builds message and passes it to the mail `worker`
+    which sends it through SMTP server to specified email
     """
     message = MIMEText(mail_text, "html")
     message["From"] = mail_from
     message["To"] = mail_to
     message["Subject"] = mail_subj
 
-    if all((MAIL_HOST, MAIL_PORT, MAIL_USERNAME, MAIL_PASSWORD)):
-        with SMTP(MAIL_HOST, MAIL_PORT) as mail_server:
-            mail_server.ehlo()
-            mail_server.starttls(context=create_default_context())
-            mail_server.ehlo()
-            mail_server.login(MAIL_USERNAME, MAIL_PASSWORD)
-            mail_server.send_message(message)
-            mail_server.quit()
-
-        logger.info(f"Mail sended to {mail_to} successfully!")
+    if all((worker.host, worker.port)):
+        worker.enqueue(message)
@@ -0,0 +1,21 @@
+from hashlib import sha256
+
+
+def make_etag(*parts):
+    """Builds strong ETag value from string representation of `parts`"""
+    digest = sha256("\n".join(map(str, parts)).encode()).hexdigest()
+
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str):
+    """Checks whether `If-None-Match` header value contains `etag`"""
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    )
@@ -0,0 +1,51 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from fastapi import HTTPException, status
+
+
+class BoundedExecutor:
+    """
+    Thread pool for CPU-heavy work which rejects new jobs
+    instead of queuing them endlessly when `max_queue_size` is reached
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int, name: str):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.name = name
+        self.pending = 0
+        self.rejected = 0
+        self.__executor = None
+
+    @property
+    def executor(self):
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name)
+
+        return self.__executor
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs `func` in the pool without blocking the event loop or
+        raises an exception about overloading if the queue is full
+        """
+        if self.pending >= self.max_workers + self.max_queue_size:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please, try again later")
+
+        self.pending += 1
+        try:
+            return await get_running_loop().run_in_executor(
+                self.executor, partial(func, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
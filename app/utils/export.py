@@ -0,0 +1,84 @@
+from csv import writer
+from datetime import datetime
+from io import StringIO
+from json import dumps
+
+from loguru import logger
+
+from app.config import TASK_EXPORT_BATCH_SIZE
+from app.configuration.db_helper import db_helper
+from app.core.crud.task import (
+    TASK_PROJECTION_FIELDS, rows_to_task_dicts, stream_tasks_rows
+)
+from app.core.schemas import TaskFilter
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+def serialize_value(value):
+    """Converts DB value to a form representable in JSON or CSV"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    return value
+
+
+def rows_to_ndjson(rows: list[dict]):
+    """
+    Renders rows as newline-delimited JSON,
+    performers are a list like in the response of `/retrieve`
+    """
+    return "".join(
+        dumps(
+            {column: serialize_value(value) for column, value in task.items()},
+            ensure_ascii=False
+        ) + "\n"
+        for task in rows_to_task_dicts(rows, TASK_PROJECTION_FIELDS)
+    )
+
+
+def rows_to_csv(rows: list[dict], header: tuple[str, ...] = ()):
+    """Renders rows as CSV lines, optionally preceded by the `header`"""
+    buffer = StringIO()
+    csv_writer = writer(buffer)
+    if header:
+        csv_writer.writerow(header)
+
+    csv_writer.writerows(
+        map(serialize_value, row.values()) for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def generate_tasks_export(
+        export_format: str,
+        filters: TaskFilter | None = None,
+        batch_size: int = TASK_EXPORT_BATCH_SIZE,
+        use_primary: bool = False
+    ):
+    """
+    Streams tasks from a replica (or primary DB) in `export_format`
+    chunk by chunk, keeping in memory no more than `batch_size` rows
+    """
+    # `logger.catch` does not wrap async generators,
+    # so errors raised while streaming are logged here
+    try:
+        session_factory = db_helper.get_read_session_factory(use_primary)
+        async with session_factory() as session:
+            if export_format == "csv":
+                # header is written even if no task matches `filters`
+                yield rows_to_csv([], header=TASK_PROJECTION_FIELDS)
+
+            async for rows in stream_tasks_rows(
+                    session, batch_size, filters):
+                if export_format == "csv":
+                    yield rows_to_csv(rows)
+                else:
+                    yield rows_to_ndjson(rows)
+
+    except Exception:
+        logger.exception(f"Export of tasks to {export_format} failed")
+        raise
@@ -0,0 +1,146 @@
+import os
+from datetime import date, datetime, timedelta
+from json import dumps
+from pathlib import Path
+from random import random
+from traceback import format_exception
+
+
+WARNING_LEVEL_NO = 30
+
+
+def json_formatter(record: dict):
+    """
+    Loguru format function rendering record as one JSON line.
+    Exception traceback is rendered as a field instead of lines of text
+    """
+    entry = dict(
+        time=record["time"].isoformat(),
+        level=record["level"].name,
+        logger=record["name"],
+        function=record["function"],
+        line=record["line"],
+        pid=record["process"].id,
+        message=record["message"],
+        **{
+            key: value for key, value in record["extra"].items()
+            if key != "json"
+        })
+
+    if record["exception"] is not None:
+        error_type, error, traceback = record["exception"]
+        entry["exception"] = dict(
+            type=getattr(error_type, "__name__", str(error_type)),
+            value=str(error),
+            traceback="".join(
+                format_exception(error_type, error, traceback)))
+
+    record["extra"]["json"] = dumps(entry, default=str, ensure_ascii=False)
+
+    return "{extra[json]}\n"
+
+
+class DailyFileSink:
+    """
+    Appends log lines to `<stem>.<date><suffix>` files, writing every
+    line with one system call. Files are never renamed, so several
+    worker processes can share them without racing on rotation.
+    Files older than `retention_days` are removed
+    """
+
+    def __init__(self, path: str | Path, retention_days: int = 7):
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.__fd = None
+        self.__file_date = None
+
+    def __call__(self, message: str):
+        today = message.record["time"].date()
+        if today != self.__file_date:
+            self.__open(today)
+
+        os.write(self.__fd, message.encode())
+
+    def __open(self, file_date: date):
+        self.stop()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.__fd = os.open(
+            self.path.with_suffix(f".{file_date}{self.path.suffix}"),
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+            0o644)
+        self.__file_date = file_date
+        self.__remove_expired(file_date)
+
+    def __remove_expired(self, today: date):
+        oldest_date = today - timedelta(days=self.retention_days)
+        for log_file in self.path.parent.glob(f"{self.path.stem}.*"):
+            try:
+                file_date = datetime.strptime(
+                    log_file.suffixes[-2].lstrip("."), "%Y-%m-%d").date()
+                if file_date < oldest_date:
+                    log_file.unlink()
+            except (IndexError, ValueError, FileNotFoundError):
+                continue
+
+    def stop(self):
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+            self.__file_date = None
+
+
+class LogSampler:
+    """
+    Filter of log records with per-logger minimal levels
+    and sampling rates of records below WARNING level.
+    Settings are matched by the longest logger name prefix
+    """
+
+    def __init__(
+            self,
+            default_level: int,
+            levels: dict[str, int],
+            sampling: dict[str, float]
+        ):
+        self.default_level = default_level
+        self.levels = levels
+        self.sampling = sampling
+        self.__cache = dict()
+
+    def settings(self, name: str):
+        settings = self.__cache.get(name)
+        if settings is None:
+            settings = self.__cache[name] = (
+                self.match(self.levels, name, self.default_level),
+                self.match(self.sampling, name, 1.0))
+
+        return settings
+
+    @staticmethod
+    def match(settings: dict, name: str, default):
+        prefixes = [
+            prefix for prefix in settings
+            if name == prefix or name.startswith(prefix + ".")
+        ]
+        return settings[max(prefixes, key=len)] if prefixes else default
+
+    def __call__(self, record: dict):
+        min_level, rate = self.settings(record["name"] or "")
+        level = record["level"].no
+        if level < min_level:
+            return False
+
+        return level >= WARNING_LEVEL_NO or rate >= 1.0 or random() < rate
+
+
+def parse_log_settings(raw_settings: str, convert=str):
+    """
+    Parses comma-separated `logger:value` pairs,
+    e.g. `app.utils.sql_instrumentation:0.1,app.core:INFO`
+    """
+    settings = dict()
+    for pair in filter(None, map(str.strip, raw_settings.split(","))):
+        name, _, value = pair.rpartition(":")
+        settings[name.strip()] = convert(value.strip())
+
+    return settings
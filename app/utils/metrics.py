@@ -0,0 +1,246 @@
+import os
+from bisect import bisect_left
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def escape_label_value(value):
+    return (
+        str(value).replace("\\", "\\\\")
+        .replace("\n", "\\n").replace('"', '\\"'))
+
+
+def format_labels(labelnames: tuple[str, ...], labelvalues: tuple):
+    if not labelnames:
+        return ""
+
+    pairs = ",".join(
+        f'{name}="{escape_label_value(value)}"'
+        for name, value in zip(labelnames, labelvalues)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base of metrics rendered in Prometheus text exposition format"""
+    metric_type = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames=tuple()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.values = dict()
+
+    def labels_key(self, labels: dict):
+        return tuple(labels[name] for name in self.labelnames)
+
+    def render_samples(self, constant_labels: dict):
+        labelnames = (*constant_labels, *self.labelnames)
+        for labelvalues, value in self.values.items():
+            labels = format_labels(
+                labelnames, (*constant_labels.values(), *labelvalues))
+            yield f"{self.name}{labels} {value}"
+
+    def render(self, constant_labels: dict):
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        yield from self.render_samples(constant_labels)
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.labels_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def set(self, value: float, **labels):
+        """Mirrors a counter maintained by another component"""
+        self.values[self.labels_key(labels)] = value
+
+
+class Gauge(Metric):
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        self.values[self.labels_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.labels_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            description: str,
+            labelnames=tuple(),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS
+        ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self.labels_key(labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+
+        bucket_index = bisect_left(self.buckets, value)
+        if bucket_index < len(self.buckets):
+            series[0][bucket_index] += 1
+
+        series[1] += value
+        series[2] += 1
+
+    def render_samples(self, constant_labels: dict):
+        series_labelnames = (*constant_labels, *self.labelnames)
+        labelnames = (*series_labelnames, "le")
+        for labelvalues, (bucket_counts, total, count) in self.values.items():
+            labelvalues = (*constant_labels.values(), *labelvalues)
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket"
+                    f"{format_labels(labelnames, (*labelvalues, upper_bound))}"
+                    f" {cumulative}")
+
+            yield (
+                f"{self.name}_bucket"
+                f"{format_labels(labelnames, (*labelvalues, '+Inf'))} {count}")
+            labels = format_labels(series_labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {total}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.metrics: list[Metric] = list()
+
+    def register(self, metric: Metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Renders all metrics of this process. Every worker process has
+        its own metrics, so they are labelled with `pid` of the worker
+        (taken at render time, since workers are forked after import)
+        """
+        constant_labels = dict(pid=os.getpid())
+        return "\n".join(
+            line for metric in self.metrics
+            for line in metric.render(constant_labels)
+        ) + "\n"
+
+
+registry = MetricsRegistry()
+http_requests_total = registry.register(Counter(
+    "http_requests_total",
+    "Number of handled HTTP requests",
+    ("method", "route", "status")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests handling",
+    ("method", "route")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Number of HTTP requests being handled"))
+password_hashing_duration_seconds = registry.register(Histogram(
+    "password_hashing_duration_seconds",
+    "Duration of bcrypt operations including waiting for a worker",
+    ("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)))
+auth_logins_total = registry.register(Counter(
+    "auth_logins_total", "Number of login attempts", ("result",)))
+db_pool_connections = registry.register(Gauge(
+    "db_pool_connections",
+    "Connections of DB pool by state",
+    ("state",)))
+db_pool_checkouts_total = registry.register(Counter(
+    "db_pool_checkouts_total", "Number of DB pool checkouts"))
+db_pool_checkout_timeouts_total = registry.register(Counter(
+    "db_pool_checkout_timeouts_total",
+    "Number of DB pool checkouts failed by timeout"))
+db_pool_checkout_wait_seconds_total = registry.register(Counter(
+    "db_pool_checkout_wait_seconds_total",
+    "Total time spent waiting for DB pool connections"))
+db_write_queue_size = registry.register(Gauge(
+    "db_write_queue_size", "Number of jobs waiting for the SQLite writer"))
+db_write_jobs_total = registry.register(Counter(
+    "db_write_jobs_total", "Number of jobs committed by the SQLite writer"))
+db_write_commits_total = registry.register(Counter(
+    "db_write_commits_total",
+    "Number of group commits made by the SQLite writer"))
+mail_queue_size = registry.register(Gauge(
+    "mail_queue_size", "Number of mails waiting for delivery"))
+mail_messages_total = registry.register(Counter(
+    "mail_messages_total",
+    "Number of processed mails by result",
+    ("result",)))
+password_hashing_pending = registry.register(Gauge(
+    "password_hashing_pending",
+    "Number of bcrypt jobs running or waiting for a worker"))
+password_hashing_rejected_total = registry.register(Counter(
+    "password_hashing_rejected_total",
+    "Number of bcrypt jobs rejected because the queue was full"))
+cache_entries = registry.register(Gauge(
+    "cache_entries", "Number of entries in cache", ("cache",)))
+cache_requests_total = registry.register(Counter(
+    "cache_requests_total", "Number of cache lookups", ("cache", "result")))
+cache_evictions_total = registry.register(Counter(
+    "cache_evictions_total", "Number of cache evictions", ("cache",)))
+task_list_cache_bytes = registry.register(Gauge(
+    "task_list_cache_bytes", "Size of serialized task listings in cache"))
+
+
+class MetricsMiddleware:
+    """
+    Counts HTTP requests and measures their latency per route template,
+    so paths with different IDs share one time series
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        response_status = 500
+        started_at = perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration_seconds.observe(
+                perf_counter() - started_at,
+                method=scope["method"],
+                route=route_path)
+            http_requests_total.inc(
+                method=scope["method"],
+                route=route_path,
+                status=response_status)
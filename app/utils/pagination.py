@@ -0,0 +1,58 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from json import dumps, loads
+
+from fastapi import HTTPException, status
+from loguru import logger
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def encode_cursor(created_at: datetime, row_id: int):
+    """Packs keyset position `(created_at, id)` into an opaque string"""
+    raw_cursor = dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+
+    return urlsafe_b64encode(raw_cursor.encode()).decode().rstrip("=")
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def decode_cursor(cursor: str):
+    """
+    Unpacks opaque string into keyset position `(created_at, id)`
+    or raises an exception about invalidity of the cursor
+    """
+    try:
+        created_at, row_id = loads(
+            urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        return datetime.fromisoformat(created_at), int(row_id)
+
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid pagination cursor «{cursor}»")
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def encode_rank_cursor(score: float, row_id: int):
+    """Packs ranked keyset position `(score, id)` into an opaque string"""
+    raw_cursor = dumps([score, row_id], separators=(",", ":"))
+
+    return urlsafe_b64encode(raw_cursor.encode()).decode().rstrip("=")
+
+
+@logger.catch(exclude=HTTPException, reraise=True)
+def decode_rank_cursor(cursor: str):
+    """
+    Unpacks opaque string into ranked keyset position `(score, id)`
+    or raises an exception about invalidity of the cursor
+    """
+    try:
+        score, row_id = loads(
+            urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        return float(score), int(row_id)
+
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid pagination cursor «{cursor}»")
@@ -0,0 +1,64 @@
+from time import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import DB_READ_YOUR_WRITES_WINDOW
+
+PRIMARY_DB_COOKIE = "db_primary_until"
+# Same mark for API clients which do not keep cookies:
+# the response header value is sent back as the request header
+PRIMARY_DB_HEADER = "X-DB-Primary-Until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def wrote_recently(connection: HTTPConnection):
+    """
+    Checks whether the client has changed data so recently
+    that replicas may not have received the change yet.
+    The mark is sent by the client, so a mark later than a fresh one
+    (e.g. forged to pin the client to the primary DB) is ignored
+    """
+    primary_until = (
+        connection.headers.get(PRIMARY_DB_HEADER)
+        or connection.cookies.get(PRIMARY_DB_COOKIE))
+    try:
+        primary_until = float(primary_until)
+    except (TypeError, ValueError):
+        return False
+
+    now = time()
+    return now < primary_until <= now + DB_READ_YOUR_WRITES_WINDOW
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks clients which have successfully changed data with a cookie
+    and a header, so their reads go to the primary DB for `window`
+    seconds. The mark is seen by all worker processes, unlike memory
+    """
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message: Message):
+            if (message["type"] == "http.response.start" and
+                    message["status"] < 400):
+                primary_until = f"{time() + self.window:.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_DB_COOKIE}={primary_until}; "
+                    f"Max-Age={int(self.window) + 1}; Path=/; "
+                    "HttpOnly; SameSite=Lax")
+                headers[PRIMARY_DB_HEADER] = primary_until
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
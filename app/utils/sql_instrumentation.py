@@ -0,0 +1,115 @@
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestSQLStats:
+    """Counters of SQL statements executed while handling one request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, duration: float, rows: int):
+        self.queries += 1
+        self.rows += max(rows, 0)
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.duration * 1000:.2f};'
+            f'desc="{self.queries} queries, {self.rows} rows"')
+
+
+current_sql_stats: ContextVar[RequestSQLStats | None] = ContextVar(
+    "current_sql_stats", default=None)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, _):
+    # start time is kept by the execution context of the statement,
+    # so a failed statement (without `after_cursor_execute`) leaves
+    # nothing behind on the pooled connection
+    context.query_started_at = perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, _):
+    duration = perf_counter() - context.query_started_at
+    stats = current_sql_stats.get()
+    if stats is not None:
+        # asyncpg reports rows of any statement,
+        # SQLite only rows changed by INSERT, UPDATE and DELETE
+        stats.record(statement, duration, cursor.rowcount)
+
+
+def instrument_engine(engine: Engine):
+    """Subscribes SQL statistics collectors to `engine` events"""
+    if not event.contains(
+            engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Collects SQL statistics of every HTTP request, emits them
+    in `Server-Timing` header and log, and warns about requests
+    exceeding `query_budget` (likely N+1 queries)
+    """
+
+    def __init__(self, app: ASGIApp, query_budget: int):
+        self.app = app
+        self.query_budget = query_budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestSQLStats()
+        token = current_sql_stats.set(stats)
+        started_at = perf_counter()
+
+        async def send_with_server_timing(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f"{stats.server_timing()}, "
+                    f"app;dur={(perf_counter() - started_at) * 1000:.2f}")
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            current_sql_stats.reset(token)
+            self.log(scope, stats, perf_counter() - started_at)
+
+    def log(self, scope: Scope, stats: RequestSQLStats, duration: float):
+        route = f"{scope['method']} {scope['path']}"
+        logger.bind(
+            route=route,
+            queries=stats.queries,
+            rows=stats.rows,
+            db_ms=round(stats.duration * 1000, 2),
+            total_ms=round(duration * 1000, 2)
+        ).info(
+            f"{route}: {stats.queries} queries, {stats.rows} rows, "
+            f"DB {stats.duration * 1000:.2f} ms "
+            f"of {duration * 1000:.2f} ms")
+
+        if stats.queries > self.query_budget:
+            statement, repeats = stats.statements.most_common(1)[0]
+            logger.warning(
+                f"{route} exceeded query budget: {stats.queries} queries "
+                f"> {self.query_budget}" + (
+                    f". Possible N+1, statement repeated {repeats} times: "
+                    f"{' '.join(statement.split())[:200]}"
+                    if repeats > 1 else ""))
@@ -4,7 +4,7 @@ from fastapi import HTTPException, status
 from loguru import logger
 
 
-@logger.catch(reraise=True)
+@logger.catch(exclude=HTTPException, reraise=True)
 def parse_like_datetime(datetime_string: str):
     """
     Parses a string into datetime using formats:
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark of JWT signing and verification
+for algorithms supported by `app.utils.auth_jwt`, and of
+`decode_jwt_cached` with the key and algorithm configured for the app.
+
+Requires the same environment variables as the app (`.env` file).
+
+Usage:
+    python -m benchmarks.jwt_algorithms [--number 2000]
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+from timeit import timeit
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.utils.auth_jwt import (
+    decode_jwt_cached, encode_jwt, verified_tokens_cache
+)
+
+PAYLOAD = dict(
+    sub="developer",
+    username="developer",
+    role="Developer",
+    exp=datetime.now(tz=timezone.utc) + timedelta(minutes=15))
+
+
+def generate_pem_pair(algorithm: str):
+    """Generates private and public PEM keys suitable for `algorithm`"""
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(65537, 2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+
+    return private_pem, public_pem
+
+
+def measure(label: str, func, number: int):
+    seconds = timeit(func, number=number)
+    print(f"{label:<40}{seconds / number * 1e6:>12.1f} µs/op")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    number = parser.parse_args().number
+
+    for algorithm in ("RS256", "ES256", "EdDSA"):
+        private_pem, public_pem = generate_pem_pair(algorithm)
+        prepare_key = jwt.get_algorithm_by_name(algorithm).prepare_key
+        private_key = prepare_key(private_pem)
+        public_key = prepare_key(public_pem)
+        token = jwt.encode(PAYLOAD, private_key, algorithm)
+
+        measure(
+            f"{algorithm} encode (PEM text)",
+            lambda: jwt.encode(PAYLOAD, private_pem, algorithm), number)
+        measure(
+            f"{algorithm} encode (parsed key)",
+            lambda: jwt.encode(PAYLOAD, private_key, algorithm), number)
+        measure(
+            f"{algorithm} decode (PEM text)",
+            lambda: jwt.decode(token, public_pem, algorithms=[algorithm]),
+            number)
+        measure(
+            f"{algorithm} decode (parsed key)",
+            lambda: jwt.decode(token, public_key, algorithms=[algorithm]),
+            number)
+
+    def decode_uncached(token: str):
+        verified_tokens_cache.clear()
+        return decode_jwt_cached(token)
+
+    token = encode_jwt(dict(sub="developer", role="Developer"))
+    measure(
+        "app decode_jwt_cached (cache miss)",
+        lambda: decode_uncached(token), number)
+    decode_jwt_cached(token)
+    measure(
+        "app decode_jwt_cached (cache hit)",
+        lambda: decode_jwt_cached(token), number)
+
+
+if __name__ == "__main__":
+    main()
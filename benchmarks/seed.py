@@ -0,0 +1,177 @@
+"""
+Synthetic dataset generator for load benchmarks.
+
+Creates `--users` users spread across `ROLE_PERMISSIONS` roles and
+`--tasks` tasks with a realistic performer fan-out: most tasks have
+one or two performers, a few have many. Generation is deterministic
+for the same `--seed`.
+
+All generated users have login `bench_<n>` and password `benchmark`.
+Database is taken from `--db-url` (SQLite file in `benchmarks/.data`
+by default); the rest of settings come from `.env` file.
+
+Usage:
+    python -m benchmarks.seed [--users 1000] [--tasks 20000] [--db-url URL]
+"""
+import os
+from argparse import ArgumentParser
+from asyncio import run
+from datetime import datetime, timedelta
+from pathlib import Path
+from random import Random
+
+BENCHMARK_DATA_DIR = Path(__file__).parent / ".data"
+BENCHMARK_PASSWORD = "benchmark"
+BATCH_SIZE = 1000
+# Share of users per role, the rest are developers
+ROLE_SHARES = {"Owner": 0.002, "Admin": 0.02, "Project Manager": 0.15}
+# Probability weights of 0, 1, 2, ... performers of a task
+PERFORMERS_FAN_OUT = (10, 40, 25, 12, 6, 3, 2, 1, 1)
+
+
+def default_db_url():
+    BENCHMARK_DATA_DIR.mkdir(exist_ok=True)
+    return f"sqlite+aiosqlite:///{BENCHMARK_DATA_DIR}/benchmark.sqlite3"
+
+
+def use_db_url(db_url: str | None):
+    """
+    Points the app to the benchmark DB.
+    Must be called before importing `app` modules
+    """
+    os.environ["PG_DB_URL"] = db_url or default_db_url()
+
+
+def generate_roles(users_count: int):
+    """Distributes roles between users, at least one of each role"""
+    roles = list()
+    for role, share in ROLE_SHARES.items():
+        roles += [role] * max(1, round(users_count * share))
+
+    return roles + ["Developer"] * max(1, users_count - len(roles))
+
+
+async def seed_dataset(
+        users_count: int,
+        tasks_count: int,
+        seed: int = 0,
+        reset: bool = True
+    ):
+    """
+    Fills DB with generated users and tasks.
+    Returns a dict with logins of generated users grouped by role
+    """
+    from sqlalchemy import insert
+
+    from app.config import ROLE_PERMISSIONS
+    from app.configuration.db_helper import db_helper
+    from app.configuration.db_schema import prepare_database
+    from app.core.crud.reference_data import reference_data
+    from app.core.models import (
+        Base, Task, User, task_user_association_table
+    )
+    from app.utils.auth_jwt import hash_password
+
+    random = Random(seed)
+    if reset:
+        async with db_helper.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    await prepare_database()
+    async with db_helper.session_factory() as session:
+        await reference_data.refresh(session)
+
+    # bcrypt is slow by design, so all users share one hash
+    hashed_password = hash_password(BENCHMARK_PASSWORD)
+    roles = generate_roles(users_count)
+    users = [
+        dict(
+            login=f"bench_{number}",
+            email=f"bench_{number}@example.com",
+            password=hashed_password,
+            role_permission_id=reference_data.get_role(role).id)
+        for number, role in enumerate(roles)
+    ]
+    logins_by_role = {role: list() for role in ROLE_PERMISSIONS}
+    ids_by_role = {role: list() for role in ROLE_PERMISSIONS}
+
+    async with db_helper.session_factory() as session:
+        for start in range(0, len(users), BATCH_SIZE):
+            batch = users[start:start + BATCH_SIZE]
+            user_ids = await session.scalars(
+                insert(User).returning(User.id, sort_by_parameter_order=True),
+                batch)
+            for user, user_id, role in zip(
+                    batch, user_ids, roles[start:start + BATCH_SIZE]):
+                logins_by_role[role].append(user["login"])
+                ids_by_role[role].append(user_id)
+
+        assignable_ids = (
+            ids_by_role["Project Manager"] + ids_by_role["Developer"])
+        creator_ids = (
+            ids_by_role["Owner"] + ids_by_role["Admin"] +
+            ids_by_role["Project Manager"])
+        status_ids = [status.id for status in reference_data.statuses.values()]
+        priority_ids = [
+            priority.id for priority in reference_data.priorities.values()
+        ]
+        now = datetime.now()
+
+        for start in range(0, tasks_count, BATCH_SIZE):
+            numbers = range(start, min(start + BATCH_SIZE, tasks_count))
+            tasks = [
+                dict(
+                    title=f"Benchmark task {number}",
+                    description=(
+                        f"Generated task {number} " * random.randint(1, 8)),
+                    responsible_person_id=random.choice(assignable_ids),
+                    status_id=random.choice(status_ids),
+                    priority_id=random.choice(priority_ids),
+                    created_by_id=random.choice(creator_ids),
+                    created_at=now - timedelta(minutes=tasks_count - number),
+                    deadline=(
+                        now + timedelta(days=random.randint(1, 365))
+                        if random.random() < 0.7 else None))
+                for number in numbers
+            ]
+            task_ids = await session.scalars(
+                insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                tasks)
+            performers = [
+                dict(task_id=task_id, user_id=user_id)
+                for task_id in task_ids
+                for user_id in random.sample(
+                    assignable_ids,
+                    min(
+                        len(assignable_ids),
+                        random.choices(
+                            range(len(PERFORMERS_FAN_OUT)),
+                            PERFORMERS_FAN_OUT)[0]))
+            ]
+            if performers:
+                await session.execute(
+                    insert(task_user_association_table), performers)
+
+        await session.commit()
+
+    return logins_by_role
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db-url")
+    args = parser.parse_args()
+
+    use_db_url(args.db_url)
+    logins_by_role = run(seed_dataset(args.users, args.tasks, args.seed))
+    print(
+        f"Generated {args.tasks} tasks and users: " + ", ".join(
+            f"{len(logins)} {role}" for role, logins in logins_by_role.items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
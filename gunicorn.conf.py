@@ -0,0 +1,36 @@
+"""
+Production server settings.
+
+Usage:
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+"""
+from app.config import (
+    SERVER_BIND,
+    SERVER_FORWARDED_ALLOW_IPS,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_MAX_REQUESTS,
+    SERVER_MAX_REQUESTS_JITTER,
+    SERVER_PRELOAD,
+    SERVER_TIMEOUT,
+    SERVER_WORKERS
+)
+
+bind = SERVER_BIND
+workers = SERVER_WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+# Imports the app once in the master process, workers share its memory
+preload_app = SERVER_PRELOAD
+# Restarts every worker after a number of requests to release memory,
+# jitter prevents all workers from restarting at once
+max_requests = SERVER_MAX_REQUESTS
+max_requests_jitter = SERVER_MAX_REQUESTS_JITTER
+timeout = SERVER_TIMEOUT
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+forwarded_allow_ips = SERVER_FORWARDED_ALLOW_IPS
+
+
+def post_fork(server, worker):
+    """Gives every worker its own DB connections"""
+    from app.configuration.db_helper import db_helper
+
+    db_helper.dispose_after_fork()
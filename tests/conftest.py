@@ -0,0 +1,68 @@
+"""
+Tests run the app against temporary SQLite databases with a generated
+JWT key pair, so they need neither `.env` file nor external services
+"""
+import os
+import sqlite3
+from pathlib import Path
+from tempfile import mkdtemp
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+TEST_DATA_DIR = Path(mkdtemp(prefix="task-tracker-tests-"))
+
+
+def generate_jwt_keys(directory: Path):
+    private_key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048)
+    private_path = directory / "jwt-private.pem"
+    public_path = directory / "jwt-public.pem"
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo))
+
+    return private_path, public_path
+
+
+private_key_path, public_key_path = generate_jwt_keys(TEST_DATA_DIR)
+os.environ.update(
+    API_PREFIX="/api/v1",
+    DEBUG_MODE="False",
+    PG_DB_URL=f"sqlite+aiosqlite:///{TEST_DATA_DIR}/primary.sqlite3",
+    DB_REPLICA_URLS=f"sqlite+aiosqlite:///{TEST_DATA_DIR}/replica.sqlite3",
+    MAIL_HOST="",
+    MAIL_USERNAME="",
+    MAIL_PASSWORD="",
+    MAIL_PORT="587",
+    AUTH_JWT_ALGORITHM="RS256",
+    AUTH_JWT_PRIVATE_KEY_PATH=str(private_key_path),
+    AUTH_JWT_PUBLIC_KEY_PATH=str(public_key_path),
+    AUTH_JWT_ACCESS_TOKEN_EXPIRE_MINUTES="15",
+    PASSWORD_HASHING_BCRYPT_ROUNDS="4",
+    LOG_FILE="")
+
+
+@pytest.fixture(scope="session")
+def replicate():
+    """
+    Returns function imitating replication:
+    replica gets the current state of primary DB
+    """
+    from sqlalchemy import make_url
+
+    from app.config import DB_REPLICA_URLS, DB_URL
+
+    def copy_primary_to_replica():
+        primary = sqlite3.connect(make_url(DB_URL).database)
+        replica = sqlite3.connect(make_url(DB_REPLICA_URLS[0]).database)
+        primary.backup(replica)
+        replica.close()
+        primary.close()
+
+    return copy_primary_to_replica
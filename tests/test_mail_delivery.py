@@ -0,0 +1,166 @@
+import asyncio
+import socket
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.core.schemas import RolePermissionSchema, UserSchema
+from app.utils import email_sender
+from app.utils.email_sender import MailWorker, TaskStatusDigest, send_mail
+
+
+class CollectingHandler:
+    """Local SMTP server handler keeping received mails in memory"""
+
+    def __init__(self):
+        self.messages = list()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(message_from_bytes(envelope.content))
+        return "250 Message accepted for delivery"
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_port():
+    return get_free_port()
+
+
+@pytest.fixture
+def smtp_server(smtp_port):
+    handler = CollectingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=smtp_port)
+    controller.start()
+    yield handler
+    controller.stop()
+
+
+def make_worker(port: int, **options):
+    return MailWorker(
+        host="127.0.0.1", port=port, starttls=False, timeout=5, **options)
+
+
+def make_user(login: str):
+    return UserSchema(
+        id=1,
+        login=login,
+        email=f"{login}@example.com",
+        password=b"",
+        role=RolePermissionSchema(id=1, position="Developer"))
+
+
+def test_queued_mails_are_delivered(smtp_server, smtp_port):
+    async def scenario():
+        worker = make_worker(smtp_port, concurrency=2)
+        await worker.start()
+        for number in range(5):
+            send_mail(
+                f"<p>Mail {number}</p>",
+                "pm@example.com",
+                f"dev{number}@example.com",
+                f"Subject {number}",
+                worker=worker)
+
+        await worker.stop(timeout=10)
+        return worker.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats == dict(queued=0, sent=5, failed=0, dropped=0)
+    assert sorted(message["To"] for message in smtp_server.messages) == [
+        f"dev{number}@example.com" for number in range(5)
+    ]
+
+
+def test_delivery_is_retried_until_server_is_available(smtp_port):
+    handler = CollectingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=smtp_port)
+
+    async def scenario():
+        worker = make_worker(smtp_port, max_retries=3, backoff=0.5)
+        await worker.start()
+        send_mail(
+            "<p>Retried</p>",
+            "pm@example.com",
+            "dev@example.com",
+            "Retried",
+            worker=worker)
+        # the first attempt is refused, the next one finds the server
+        await asyncio.sleep(0.2)
+        controller.start()
+        await worker.stop(timeout=10)
+        return worker.stats()
+
+    try:
+        stats = asyncio.run(scenario())
+    finally:
+        controller.stop()
+
+    assert stats["sent"] == 1 and stats["failed"] == 0
+    assert [message["Subject"] for message in handler.messages] == ["Retried"]
+
+
+def test_digest_is_flushed_on_shutdown(smtp_server, smtp_port, monkeypatch):
+    # digest sends mails through the app-wide worker
+    worker = email_sender.mail_worker
+    monkeypatch.setattr(worker, "host", "127.0.0.1")
+    monkeypatch.setattr(worker, "port", smtp_port)
+    monkeypatch.setattr(worker, "starttls", False)
+
+    async def scenario():
+        digest = TaskStatusDigest(window=60)
+        await worker.start()
+        recipient = make_user("dev")
+        digest.add(recipient, 1, "First task", "Done", "pm@example.com")
+        digest.add(
+            recipient, 2, "Second task", "In progress", "pm@example.com")
+        # same order as in the app shutdown
+        digest.flush_all()
+        await worker.stop(timeout=10)
+
+    asyncio.run(scenario())
+
+    assert len(smtp_server.messages) == 1
+    body = smtp_server.messages[0].get_payload(decode=True).decode()
+    assert "First task" in body and "Second task" in body
+
+
+def test_worker_survives_unexpected_error(smtp_server, smtp_port, monkeypatch):
+    worker = make_worker(smtp_port, concurrency=1)
+    connect = worker._MailWorker__connect
+    calls = list()
+
+    def connect_failing_once():
+        calls.append(None)
+        if len(calls) == 1:
+            raise ValueError("Unexpected failure")
+
+        return connect()
+
+    monkeypatch.setattr(worker, "_MailWorker__connect", connect_failing_once)
+
+    async def scenario():
+        await worker.start()
+        for number in range(2):
+            send_mail(
+                f"<p>Mail {number}</p>",
+                "pm@example.com",
+                "dev@example.com",
+                f"Subject {number}",
+                worker=worker)
+
+        await worker.stop(timeout=10)
+        return worker.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["failed"] == 1 and stats["sent"] == 1
+    assert [message["Subject"] for message in smtp_server.messages] == [
+        "Subject 1"
+    ]
@@ -0,0 +1,129 @@
+from time import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from app.config import API_PREFIX
+from app.utils.read_your_writes import PRIMARY_DB_COOKIE, PRIMARY_DB_HEADER
+
+
+def register(client: TestClient, login: str, role: str):
+    response = client.post(
+        API_PREFIX + "/user/register",
+        data=dict(
+            login=login,
+            email=f"{login}@example.com",
+            password="password123",
+            role=role))
+    assert response.status_code == 201, response.text
+
+
+@pytest.fixture(scope="module")
+def client(replicate):
+    with TestClient(create_app()) as client:
+        register(client, "replica_pm", "Project Manager")
+        register(client, "replica_dev", "Developer")
+        replicate()
+        client.cookies.clear()
+        yield client
+
+
+@pytest.fixture(scope="module")
+def auth_headers(client: TestClient):
+    response = client.post(
+        API_PREFIX + "/auth/jwt/login",
+        data=dict(username="replica_pm", password="password123"))
+    client.cookies.clear()
+
+    return dict(Authorization=f"Bearer {response.json()['access_token']}")
+
+
+def create_task(client: TestClient, auth_headers: dict, title: str):
+    response = client.post(
+        API_PREFIX + "/task/create",
+        headers=auth_headers,
+        json=dict(
+            title=title,
+            responsible_person="replica_dev@example.com",
+            performers=[],
+            priority="Lowest"))
+    assert response.status_code == 201, response.text
+
+    return response
+
+
+def retrieve_titles(client: TestClient, headers: dict | None = None):
+    response = client.get(
+        API_PREFIX + "/task/retrieve",
+        params=dict(limit=100),
+        headers=headers)
+    assert response.status_code == 200, response.text
+
+    return {task["title"] for task in response.json()["items"]}
+
+
+def test_reads_go_to_replica(client, auth_headers, replicate):
+    create_task(client, auth_headers, "Not replicated yet")
+    client.cookies.clear()
+
+    assert "Not replicated yet" not in retrieve_titles(client)
+
+    replicate()
+
+    assert "Not replicated yet" in retrieve_titles(client)
+
+
+def test_cookie_keeps_reads_on_primary_after_write(client, auth_headers):
+    create_task(client, auth_headers, "Read by cookie")
+
+    assert PRIMARY_DB_COOKIE in client.cookies
+    assert "Read by cookie" in retrieve_titles(client)
+
+    client.cookies.clear()
+    assert "Read by cookie" not in retrieve_titles(client)
+
+
+def test_header_keeps_reads_on_primary_after_write(client, auth_headers):
+    response = create_task(client, auth_headers, "Read by header")
+    client.cookies.clear()
+    primary_until = response.headers[PRIMARY_DB_HEADER]
+
+    assert "Read by header" in retrieve_titles(
+        client, {PRIMARY_DB_HEADER: primary_until})
+    assert "Read by header" not in retrieve_titles(client)
+
+
+def test_auth_user_is_read_from_replica(client, replicate):
+    register(client, "replica_new", "Developer")
+    client.cookies.clear()
+    response = client.post(
+        API_PREFIX + "/auth/jwt/login",
+        data=dict(username="replica_new", password="password123"))
+    client.cookies.clear()
+    headers = dict(Authorization=f"Bearer {response.json()['access_token']}")
+
+    # user is not replicated yet
+    response = client.get(API_PREFIX + "/user/details", headers=headers)
+    assert response.status_code == 401
+
+    replicate()
+    response = client.get(API_PREFIX + "/user/details", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["login"] == "replica_new"
+
+
+@pytest.mark.parametrize(
+    "primary_until",
+    ["9e18", "inf", "nan", "not a number", str(time() + 3600)])
+def test_forged_mark_does_not_pin_reads_to_primary(
+        client, auth_headers, primary_until):
+    create_task(client, auth_headers, f"Forged mark {primary_until}")
+    client.cookies.clear()
+
+    assert f"Forged mark {primary_until}" not in retrieve_titles(
+        client, {PRIMARY_DB_HEADER: primary_until})
+
+    client.cookies.set(PRIMARY_DB_COOKIE, primary_until)
+    assert f"Forged mark {primary_until}" not in retrieve_titles(client)
+    client.cookies.clear()
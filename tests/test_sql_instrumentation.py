@@ -0,0 +1,59 @@
+from time import sleep
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.utils.sql_instrumentation import (
+    RequestSQLStats, current_sql_stats, instrument_engine
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER)"))
+        connection.execute(text("INSERT INTO item VALUES (1), (2), (3)"))
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def stats():
+    stats = RequestSQLStats()
+    token = current_sql_stats.set(stats)
+    yield stats
+    current_sql_stats.reset(token)
+
+
+def test_failed_statement_does_not_skew_durations(engine, stats):
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_down_failing(conn, cursor, statement, *_):
+        if "missing" in statement:
+            sleep(0.2)
+
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing"))
+
+        connection.execute(text("UPDATE item SET id = id + 1"))
+
+    assert stats.queries == 1
+    assert stats.rows == 3
+    assert stats.duration < 0.1
+
+
+def test_pooled_connection_keeps_no_timing_state(engine, stats):
+    with engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+
+        connection.execute(text("SELECT * FROM item"))
+        assert connection.info == dict()
+
+    # rows of SELECT are not reported by SQLite
+    assert stats.queries == 1 and stats.rows == 0
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configuration.db_helper import DatabaseHelper
+
+metadata = MetaData()
+item = Table(
+    "item", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, unique=True))
+
+
+class JobFailure(Exception):
+    pass
+
+
+async def insert_item(session: AsyncSession, name: str):
+    item_id = await session.scalar(
+        insert(item).values(name=name).returning(item.c.id))
+    await session.commit()
+
+    return item_id
+
+
+async def insert_item_and_fail(session: AsyncSession, name: str):
+    await session.execute(insert(item).values(name=name))
+    raise JobFailure(name)
+
+
+async def get_item_names(session: AsyncSession):
+    return set(await session.scalars(select(item.c.name)))
+
+
+@pytest.fixture
+def helper(tmp_path):
+    return DatabaseHelper(
+        f"sqlite+aiosqlite:///{tmp_path}/writer.sqlite3",
+        pool_size=0,
+        replica_urls=[],
+        sqlite_single_writer=True)
+
+
+def run_groups(helper: DatabaseHelper, *groups: list[tuple]):
+    """
+    Runs jobs of every group concurrently, so the writer commits them
+    together, and groups one after another. Returns results of jobs
+    of every group and names of items committed in the end
+    """
+    async def scenario():
+        async with helper.engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+
+        await helper.sqlite_writer.start()
+        try:
+            results = list()
+            for jobs in groups:
+                async with helper.session_factory() as session:
+                    results.append(await asyncio.gather(
+                        *(helper.run_write(session, *job) for job in jobs),
+                        return_exceptions=True))
+
+            async with helper.session_factory() as session:
+                names = await get_item_names(session)
+
+        finally:
+            await helper.sqlite_writer.stop()
+            await helper.dispose()
+
+        return results, names
+
+    return asyncio.run(scenario())
+
+
+def test_failed_job_rolls_back_only_its_savepoint(helper):
+    [results], names = run_groups(helper, [
+        (insert_item, "first"),
+        (insert_item_and_fail, "failed"),
+        (insert_item, "second"),
+        (insert_item, "first"),
+        (get_item_names,)
+    ])
+
+    assert isinstance(results[0], int) and isinstance(results[2], int)
+    assert isinstance(results[1], JobFailure)
+    assert isinstance(results[3], IntegrityError)
+    # later jobs of the group see changes of the earlier ones,
+    # but nothing of the failed jobs
+    assert results[4] == {"first", "second"}
+    assert names == {"first", "second"}
+    assert helper.sqlite_writer.stats() == dict(queued=0, jobs=5, commits=1)
+
+
+def test_callers_get_own_results(helper):
+    [results], names = run_groups(
+        helper, [(insert_item, f"item {number}") for number in range(10)])
+
+    assert sorted(results) == list(range(1, 11))
+    assert names == {f"item {number}" for number in range(10)}
+
+
+def test_writer_keeps_working_after_failed_group(helper):
+    ([failed], [succeeded]), names = run_groups(
+        helper,
+        [(insert_item_and_fail, "failed")],
+        [(insert_item, "after failure")])
+
+    assert isinstance(failed, JobFailure)
+    assert isinstance(succeeded, int)
+    assert names == {"after failure"}
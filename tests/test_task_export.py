@@ -0,0 +1,31 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from app.config import API_PREFIX
+from app.core.crud.task import TASK_PROJECTION_FIELDS
+
+
+@pytest.fixture(scope="module")
+def client(replicate):
+    with TestClient(create_app()) as client:
+        replicate()
+        yield client
+
+
+def export_tasks(client: TestClient, **params):
+    response = client.get(API_PREFIX + "/task/export", params=params)
+    assert response.status_code == 200, response.text
+
+    return response.text
+
+
+def test_csv_export_without_matches_has_header(client):
+    content = export_tasks(
+        client, format="csv", created_by="nobody@example.com")
+
+    assert content.splitlines() == [",".join(TASK_PROJECTION_FIELDS)]
+
+
+def test_ndjson_export_without_matches_is_empty(client):
+    assert export_tasks(client, created_by="nobody@example.com") == ""
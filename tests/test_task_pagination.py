@@ -0,0 +1,131 @@
+import sqlite3
+from base64 import urlsafe_b64encode
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import make_url
+
+from app import create_app
+from app.config import API_PREFIX, DB_URL
+
+TASKS_COUNT = 5
+CREATED_BY = "paging_pm@example.com"
+
+
+def register(client: TestClient, login: str, role: str):
+    response = client.post(
+        API_PREFIX + "/user/register",
+        data=dict(
+            login=login,
+            email=f"{login}@example.com",
+            password="password123",
+            role=role))
+    assert response.status_code == 201, response.text
+
+
+def set_same_created_at(login: str):
+    """Gives all tasks of the user the same creation time"""
+    primary = sqlite3.connect(make_url(DB_URL).database)
+    with primary:
+        primary.execute(
+            "UPDATE task SET created_at = '2024-01-01 00:00:00.000000' "
+            "WHERE created_by_id = (SELECT id FROM user WHERE login = ?)",
+            (login,))
+    primary.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(create_app()) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def task_ids(client: TestClient, replicate):
+    """Creates tasks of one user with the same creation time"""
+    register(client, "paging_pm", "Project Manager")
+    register(client, "paging_dev", "Developer")
+    response = client.post(
+        API_PREFIX + "/auth/jwt/login",
+        data=dict(username="paging_pm", password="password123"))
+    headers = dict(Authorization=f"Bearer {response.json()['access_token']}")
+    task_ids = list()
+    for number in range(TASKS_COUNT):
+        response = client.post(
+            API_PREFIX + "/task/create",
+            headers=headers,
+            json=dict(
+                title=f"Paged task {number}",
+                responsible_person="paging_dev@example.com",
+                performers=[],
+                priority="Lowest"))
+        assert response.status_code == 201, response.text
+        task_ids.append(response.json()["id"])
+
+    set_same_created_at("paging_pm")
+    replicate()
+    client.cookies.clear()
+
+    return task_ids
+
+
+def get_page(client: TestClient, limit: int, cursor: str | None, **params):
+    response = client.get(
+        API_PREFIX + "/task/retrieve",
+        params=dict(
+            limit=limit,
+            created_by=CREATED_BY,
+            **params,
+            **(dict(cursor=cursor) if cursor else dict())))
+    assert response.status_code == 200, response.text
+
+    return response.json()
+
+
+def get_all_pages(client: TestClient, limit: int, **params):
+    pages = [get_page(client, limit, None, **params)]
+    while pages[-1]["next_cursor"]:
+        pages.append(
+            get_page(client, limit, pages[-1]["next_cursor"], **params))
+
+    return pages
+
+
+@pytest.mark.parametrize("params", [dict(), dict(fields="id,title")])
+def test_pages_split_tasks_with_equal_created_at(client, task_ids, params):
+    pages = get_all_pages(client, 2, **params)
+
+    assert [len(page["items"]) for page in pages] == [2, 2, 1]
+    # `id` breaks ties of `created_at`, so no task is skipped or repeated
+    assert [
+        task["id"] for page in pages for task in page["items"]
+    ] == task_ids
+
+
+@pytest.mark.parametrize("limit", [TASKS_COUNT, TASKS_COUNT + 1])
+def test_last_page_has_no_next_cursor(client, task_ids, limit):
+    page = get_page(client, limit, None)
+
+    assert len(page["items"]) == TASKS_COUNT
+    assert page["next_cursor"] is None
+
+
+def encode(raw_cursor: str):
+    return urlsafe_b64encode(raw_cursor.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    encode('["2024-01-01T00:00:00"'),
+    encode('["yesterday",1]'),
+    encode('[1,2]'),
+    encode('["2024-01-01T00:00:00",[1]]'),
+    encode('{"created_at":"2024-01-01T00:00:00"}'),
+    encode("null"),
+])
+def test_tampered_cursor_is_rejected(client, cursor):
+    response = client.get(
+        API_PREFIX + "/task/retrieve", params=dict(limit=2, cursor=cursor))
+
+    assert response.status_code == 422
+    assert "Invalid pagination cursor" in response.json()["detail"]